@@ -1,8 +1,10 @@
 import requests
 
-# Replace with your Adzuna credentials
-APP_ID = 'ca7aba49'
-APP_KEY = 'da0c323b9c0f3c974ec92c41a9db4f7b'
+from config import ADZUNA_APP_ID as APP_ID, ADZUNA_APP_KEY as APP_KEY
+
+# Adzuna credentials come from ADZUNA_APP_ID / ADZUNA_APP_KEY (Streamlit secrets or the environment)
+if not APP_ID or not APP_KEY:
+    raise SystemExit("Set ADZUNA_APP_ID and ADZUNA_APP_KEY in Streamlit secrets or the environment.")
 
 # Job search parameters
 country = 'in'  # 'in' = India
@@ -1,25 +1,9 @@
 import streamlit as st
-import requests
-
-# Adzuna API credentials (register at https://developer.adzuna.com/)
-APP_ID = "ca7aba49"
-APP_KEY = "da0c323b9c0f3c974ec92c41a9db4f7b"
+from utils.adzuna_client import search_jobs
 
 def fetch_adzuna_jobs(query, location="India", results_per_page=10):
-    url = f"https://api.adzuna.com/v1/api/jobs/in/search/1"
-    params = {
-        "app_id": APP_ID,
-        "app_key": APP_KEY,
-        "what": query,
-        "where": location,
-        "results_per_page": results_per_page,
-        "content-type": "application/json",
-    }
-
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json().get("results", [])
+        return search_jobs(query, where=location, results_per_page=results_per_page, country="in")
     except Exception as e:
         st.error(f"Failed to fetch job listings: {e}")
         return []
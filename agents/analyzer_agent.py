@@ -1,6 +1,76 @@
-from typing import Dict, Any
-from .base_agent import BaseAgent
+import copy
 from datetime import datetime
+from typing import Any, Dict, Tuple
+from .base_agent import BaseAgent
+from .messages import AnalysisResult
+from utils.serialization import dumps_str
+
+# JSON shape requested from Gemini, shared with the fused extraction prompt
+ANALYSIS_SCHEMA = """{
+            "technical_skills": ["skill1", "skill2"],
+            "years_of_experience": number,
+            "education": {
+                "level": "Bachelors/Masters/PhD",
+                "field": "field of study"
+            },
+            "experience_level": "Junior/Mid-level/Senior",
+            "key_achievements": ["achievement1", "achievement2"],
+            "domain_expertise": ["domain1", "domain2"]
+        }"""
+
+# Used when Gemini's answer is unusable, and per key when a field is missing or mistyped
+ANALYSIS_DEFAULTS: Dict[str, Any] = {
+    "technical_skills": [],
+    "years_of_experience": 0,
+    "education": {"level": "Unknown", "field": "Unknown"},
+    "experience_level": "Junior",
+    "key_achievements": [],
+    "domain_expertise": [],
+}
+
+
+def _matches_default(value: Any, default: Any) -> bool:
+    if isinstance(default, (int, float)):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, type(default))
+
+
+def validate_analysis(parsed: Any) -> Tuple[Dict[str, Any], bool]:
+    """Check a parsed `skills_analysis` against ANALYSIS_DEFAULTS.
+
+    Returns the analysis with missing or mistyped keys replaced by their
+    defaults, and whether the whole answer was unusable: not a dict, an error,
+    or a dict (e.g. `{}` or `{"analysis": {...}}`) with no valid schema key.
+    """
+    if not isinstance(parsed, dict) or "error" in parsed:
+        return copy.deepcopy(ANALYSIS_DEFAULTS), True
+    analysis = dict(parsed)
+    years = analysis.get("years_of_experience")
+    if isinstance(years, str):
+        try:
+            analysis["years_of_experience"] = float(years.strip().rstrip("+"))
+        except ValueError:
+            pass
+    usable = False
+    for key, default in ANALYSIS_DEFAULTS.items():
+        if _matches_default(analysis.get(key), default):
+            usable = True
+        else:
+            analysis[key] = copy.deepcopy(default)
+    if not usable:
+        return copy.deepcopy(ANALYSIS_DEFAULTS), True
+    return analysis, False
+
+
+def build_analysis_result(parsed: Any) -> AnalysisResult:
+    """AnalysisResult from Gemini's parsed answer; fallback defaults get the base confidence"""
+    analysis, used_fallback = validate_analysis(parsed)
+    return AnalysisResult(
+        skills_analysis=analysis,
+        analysis_timestamp=str(datetime.now().date()),
+        domain_expertise=analysis["domain_expertise"],
+        confidence_score=0.5 if used_fallback else 0.85,
+    )
 
 
 class AnalyzerAgent(BaseAgent):
@@ -18,36 +88,27 @@ class AnalyzerAgent(BaseAgent):
             Format the output as structured data."""
         )
 
-    async def run(self, messages: list) -> Dict[str, Any]:
+    async def run(self, messages: list) -> AnalysisResult:
         print("🔍 Analyzer: Analyzing candidate profile")
 
         try:
-            payload = eval(messages[-1]["content"])
+            payload = self._read_payload(messages)
             resume_data = payload.get("extracted_resume", {})
             university_context = payload.get("university_context", "")
             structured = resume_data.get("structured_data", {})
         except Exception as e:
             print(f"[Analyzer Error] Failed to parse input: {e}")
+            university_context = ""
             structured = {}
 
         analysis_prompt = f"""
         Analyze the candidate based on the resume data below and optionally include insights from university curriculum context.
 
         Return JSON in this structure:
-        {{
-            "technical_skills": ["skill1", "skill2"],
-            "years_of_experience": number,
-            "education": {{
-                "level": "Bachelors/Masters/PhD",
-                "field": "field of study"
-            }},
-            "experience_level": "Junior/Mid-level/Senior",
-            "key_achievements": ["achievement1", "achievement2"],
-            "domain_expertise": ["domain1", "domain2"]
-        }}
+        {ANALYSIS_SCHEMA}
 
         Resume structured data:
-        {structured}
+        {dumps_str(structured)}
 
         University context (optional):
         {university_context}
@@ -55,22 +116,8 @@ class AnalyzerAgent(BaseAgent):
         Return ONLY the JSON object.
         """
 
-        response = self._query_gemini(analysis_prompt)
-        parsed = self._parse_json_safely(response)
-
-        if "error" in parsed:
-            parsed = {
-                "technical_skills": [],
-                "years_of_experience": 0,
-                "education": {"level": "Unknown", "field": "Unknown"},
-                "experience_level": "Junior",
-                "key_achievements": [],
-                "domain_expertise": [],
-            }
-
-        return {
-            "skills_analysis": parsed,
-            "analysis_timestamp": str(datetime.now().date()),
-            "domain_expertise": parsed.get("domain_expertise", []),
-            "confidence_score": 0.85 if "error" not in parsed else 0.5,
-        }
+        response = await self._query_gemini_async(analysis_prompt, validate=self._is_usable_analysis)
+        return build_analysis_result(self._parse_json_safely(response))
+
+    def _is_usable_analysis(self, text: str) -> bool:
+        return not validate_analysis(self._parse_json_safely(text))[1]
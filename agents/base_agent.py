@@ -1,6 +1,16 @@
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Optional
+import ast
 import json
-from utils.gemini_client import query_gemini_proxy  # ✅ Add this import
+import time
+from agents.messages import AgentMessage
+from utils.gemini_client import (
+    is_error_response,
+    query_gemini_proxy,
+    query_gemini_proxy_async,
+    stream_gemini_proxy,
+)
+from utils.llm_cache import get_llm_cache, llm_cache_key
+from utils.tracing import Span, payload_size, span
 
 
 class BaseAgent:
@@ -12,13 +22,110 @@ class BaseAgent:
         """Default run method to be overridden by child classes"""
         raise NotImplementedError("Subclasses must implement run()")
 
-    def _query_gemini(self, prompt: str) -> str:
-        """Use Gemini proxy to generate response from prompt"""
+    def _read_payload(self, messages: list) -> Dict[str, Any]:
+        """Return the structured input of the last message.
+
+        The orchestrator passes an AgentMessage by reference; plain dicts and
+        JSON / Python-literal strings are still accepted from standalone callers.
+        """
+        content = messages[-1]["content"]
+        if isinstance(content, AgentMessage):
+            return content.payload
+        if isinstance(content, dict):
+            return content
         try:
-            return query_gemini_proxy(prompt=prompt, instructions=self.instructions)
-        except Exception as e:
-            print(f"Error querying Gemini Proxy: {str(e)}")
-            return f"Proxy Error: {str(e)}"
+            return json.loads(content)
+        except (TypeError, ValueError):
+            return ast.literal_eval(content)
+
+    def _cached_response(self, prompt: str, validate: Optional[Callable[[str], bool]] = None):
+        """Return (cache, key, cached response or None) for this agent's prompt.
+
+        A cached response that `validate` rejects (e.g. stored before the check
+        existed) is deleted and treated as a miss.
+        """
+        cache = get_llm_cache()
+        if cache is None:
+            return None, None, None
+        key = llm_cache_key(self.instructions, prompt)
+        cached = cache.get(key)
+        if cached is not None and validate is not None and not validate(cached):
+            cache.delete(key)
+            cached = None
+        return cache, key, cached
+
+    @staticmethod
+    def _should_cache(response: str, validate: Optional[Callable[[str], bool]]) -> bool:
+        """Only usable answers are cached, so a rerun asks Gemini again after a bad one"""
+        return not is_error_response(response) and (validate is None or validate(response))
+
+    def _is_json_response(self, text: str) -> bool:
+        """Validator for prompts that must return a JSON object"""
+        return "error" not in self._parse_json_safely(text)
+
+    def _gemini_span(self, prompt: str, mode: str = "generate") -> Span:
+        return span(f"gemini.{mode}", agent=self.name, request_bytes=payload_size(prompt))
+
+    def _traced(self, current: Span, response: str, cache_hit: bool = False) -> str:
+        """Record response size, cache hit and error state on `current`, then return the response"""
+        current.set(response_bytes=payload_size(response), cache_hit=cache_hit)
+        if is_error_response(response):
+            current.fail(response[:200])
+        return response
+
+    def _query_gemini(self, prompt: str, validate: Optional[Callable[[str], bool]] = None) -> str:
+        """Use Gemini proxy to generate response from prompt; only responses passing `validate` are cached"""
+        with self._gemini_span(prompt) as current:
+            try:
+                cache, key, cached = self._cached_response(prompt, validate)
+                if cached is not None:
+                    return self._traced(current, cached, cache_hit=True)
+                response = query_gemini_proxy(prompt=prompt, instructions=self.instructions)
+                if cache is not None and self._should_cache(response, validate):
+                    cache.set(key, response)
+                return self._traced(current, response)
+            except Exception as e:
+                print(f"Error querying Gemini Proxy: {str(e)}")
+                return self._traced(current, f"Proxy Error: {str(e)}")
+
+    async def _query_gemini_async(self, prompt: str, validate: Optional[Callable[[str], bool]] = None) -> str:
+        """Awaitable Gemini proxy call that does not block the event loop; only responses passing `validate` are cached"""
+        with self._gemini_span(prompt) as current:
+            try:
+                cache, key, cached = self._cached_response(prompt, validate)
+                if cached is not None:
+                    return self._traced(current, cached, cache_hit=True)
+                response = await query_gemini_proxy_async(prompt=prompt, instructions=self.instructions)
+                if cache is not None and self._should_cache(response, validate):
+                    cache.set(key, response)
+                return self._traced(current, response)
+            except Exception as e:
+                print(f"Error querying Gemini Proxy: {str(e)}")
+                return self._traced(current, f"Proxy Error: {str(e)}")
+
+    async def _stream_gemini_async(self, prompt: str, on_update: Callable[[str], Any]) -> str:
+        """Like _query_gemini_async, but calls `on_update` with the text so far as chunks arrive"""
+        with self._gemini_span(prompt, mode="stream") as current:
+            started = time.perf_counter()
+            try:
+                cache, key, cached = self._cached_response(prompt)
+                if cached is not None:
+                    on_update(cached)
+                    return self._traced(current, cached, cache_hit=True)
+                text = ""
+                async for chunk in stream_gemini_proxy(prompt=prompt, instructions=self.instructions):
+                    if is_error_response(chunk):
+                        return self._traced(current, chunk)
+                    if not text:
+                        current.set(first_chunk_s=round(time.perf_counter() - started, 4))
+                    text += chunk
+                    on_update(text)
+                if cache is not None and text:
+                    cache.set(key, text)
+                return self._traced(current, text)
+            except Exception as e:
+                print(f"Error querying Gemini Proxy: {str(e)}")
+                return self._traced(current, f"Proxy Error: {str(e)}")
 
     def _parse_json_safely(self, text: str) -> Dict[str, Any]:
         """Safely parse JSON from text, handling potential errors"""
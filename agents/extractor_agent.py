@@ -1,6 +1,77 @@
-from typing import Dict, Any
-from pdfminer.high_level import extract_text  # pip install pdfminer.six
+import hashlib
+import threading
+import time
+from typing import Any, Optional, Tuple
+from .analyzer_agent import ANALYSIS_SCHEMA, build_analysis_result, validate_analysis
 from .base_agent import BaseAgent
+from .messages import AnalysisResult, ExtractionResult
+from config import CACHE_DB_PATH, EXTRACTION_CACHE_ENABLED, EXTRACTION_CACHE_TTL, GEMINI_MODEL, PDF_MAX_PAGES
+from utils.cache import TieredCache, make_cache_key
+from utils.pdf_extractor import iter_pdf_pages, read_pdf_bytes
+from utils.tracing import annotate
+
+EXTRACTION_PROMPT = """
+        You are a resume parser. Extract the following fields from the text:
+
+        - Full Name
+        - Contact Info (email and phone)
+        - Education (degree, field, institution, dates)
+        - Work Experience (title, company, dates, responsibilities)
+        - Technical and Soft Skills
+        - Certifications (if any)
+
+        Text to analyze:
+        {raw_text}
+
+        Return the result as a JSON object.
+        """
+
+# Fused mode: one call returns both the extractor's and the analyzer's output
+FUSED_PROMPT = """
+        You are a resume parser and candidate analyst. From the text below, return ONE JSON object with exactly two keys.
+
+        "structured_data": the resume fields
+        - Full Name
+        - Contact Info (email and phone)
+        - Education (degree, field, institution, dates)
+        - Work Experience (title, company, dates, responsibilities)
+        - Technical and Soft Skills
+        - Certifications (if any)
+
+        "skills_analysis": the candidate analysis, optionally using the university curriculum context, in this structure:
+        {analysis_schema}
+
+        University context (optional):
+        {university_context}
+
+        Text to analyze:
+        {raw_text}
+
+        Return ONLY the JSON object.
+        """
+
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[TieredCache]:
+    """Persistent store of extractor output keyed by resume content hash, or None when disabled"""
+    global _extraction_cache
+    if not EXTRACTION_CACHE_ENABLED:
+        return None
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                _extraction_cache = TieredCache("extraction", CACHE_DB_PATH, ttl=EXTRACTION_CACHE_TTL)
+    return _extraction_cache
+
+
+def resume_content_hash(resume_data: dict, pdf_bytes: Optional[bytes] = None) -> str:
+    """SHA-256 of the resume PDF (upload bytes or file path), or of its plain text"""
+    pdf_source = resume_data.get("file_bytes") or resume_data.get("file_path")
+    if pdf_source is not None:
+        return hashlib.sha256(pdf_bytes if pdf_bytes is not None else read_pdf_bytes(pdf_source)).hexdigest()
+    return hashlib.sha256(resume_data.get("text", "").encode("utf-8")).hexdigest()
 
 
 class ExtractorAgent(BaseAgent):
@@ -12,40 +83,132 @@ class ExtractorAgent(BaseAgent):
             Provide output in a clear, structured format as JSON only."""
         )
 
-    async def run(self, messages: list) -> Dict[str, Any]:
+    @property
+    def template_fingerprint(self) -> str:
+        """Changes whenever the model, instructions, prompt template or page cap change, invalidating cached output"""
+        return make_cache_key(GEMINI_MODEL, self.instructions, EXTRACTION_PROMPT, PDF_MAX_PAGES)[:16]
+
+    def invalidate_cache(self) -> None:
+        """Drop every cached extraction"""
+        cache = get_extraction_cache()
+        if cache is not None:
+            cache.clear()
+
+    @property
+    def fused_fingerprint(self) -> str:
+        """Like template_fingerprint, for the fused extraction + analysis prompt"""
+        return make_cache_key(GEMINI_MODEL, self.instructions, FUSED_PROMPT, ANALYSIS_SCHEMA, PDF_MAX_PAGES)[:16]
+
+    @staticmethod
+    def _read_source(resume_data: dict) -> Tuple[Optional[bytes], str]:
+        """PDF bytes (upload bytes/buffer or file path; None for plain text) and the resume content hash"""
+        pdf_source = resume_data.get("file_bytes") or resume_data.get("file_path")
+        pdf_bytes = read_pdf_bytes(pdf_source) if pdf_source is not None else None
+        return pdf_bytes, resume_content_hash(resume_data, pdf_bytes)
+
+    @staticmethod
+    async def _read_text(resume_data: dict, pdf_bytes: Optional[bytes]) -> str:
+        """Raw text of the PDF (parsed page by page off the event loop) or the plain-text fallback"""
+        if pdf_bytes is None:
+            return resume_data.get("text", "")
+        pages = []
+        async for page in iter_pdf_pages(pdf_bytes):
+            pages.append(page)
+        return "".join(pages)
+
+    async def run(self, messages: list) -> ExtractionResult:
         """Process the resume and extract information"""
         print("📄 Extractor: Processing resume")
 
-        resume_data = eval(messages[-1]["content"])
+        resume_data = self._read_payload(messages)
+        pdf_bytes, content_hash = self._read_source(resume_data)
 
-        # Extract raw text from PDF file path or fallback
-        if resume_data.get("file_path"):
-            raw_text = extract_text(resume_data["file_path"])
-        else:
-            raw_text = resume_data.get("text", "")
+        cache = get_extraction_cache()
+        cache_key = make_cache_key("extraction", content_hash, self.template_fingerprint)
+        cached = cache.get(cache_key) if cache is not None else None
+        annotate(cache_hit=cached is not None, request_bytes=len(pdf_bytes) if pdf_bytes is not None else 0)
+        if cached is not None:
+            print("📄 Extractor: Reusing cached extraction")
+            return ExtractionResult.from_dict({**cached, "cache_hit": True})
+
+        started = time.perf_counter()
+        raw_text = await self._read_text(resume_data, pdf_bytes)
 
         # 🧠 Build structured prompt for Gemini
-        prompt = f"""
-        You are a resume parser. Extract the following fields from the text:
+        prompt = EXTRACTION_PROMPT.format(raw_text=raw_text)
 
-        - Full Name
-        - Contact Info (email and phone)
-        - Education (degree, field, institution, dates)
-        - Work Experience (title, company, dates, responsibilities)
-        - Technical and Soft Skills
-        - Certifications (if any)
+        response = await self._query_gemini_async(prompt, validate=self._is_json_response)
+        structured = self._parse_json_safely(response)
 
-        Text to analyze:
-        {raw_text}
+        result = ExtractionResult(
+            raw_text=raw_text,
+            structured_data=structured,
+            content_hash=content_hash,
+            extraction_time=round(time.perf_counter() - started, 4),
+        )
+        if cache is not None and "error" not in structured:
+            cache.set(cache_key, result.to_dict())
 
-        Return the result as a JSON object.
+        return result
+
+    @staticmethod
+    def _split_fused(parsed: dict) -> Tuple[dict, Any]:
+        """(structured_data, skills_analysis) of a parsed fused answer, with error markers when missing"""
+        if "error" in parsed:
+            return parsed, parsed
+        structured = parsed.get("structured_data")
+        if not isinstance(structured, dict):
+            structured = {"error": "No structured_data in fused response"}
+        return structured, parsed.get("skills_analysis", {"error": "No skills_analysis in fused response"})
+
+    def _is_fused_response(self, text: str) -> bool:
+        structured, analysis_data = self._split_fused(self._parse_json_safely(text))
+        return "error" not in structured and not validate_analysis(analysis_data)[1]
+
+    async def run_fused(self, messages: list) -> Tuple[ExtractionResult, AnalysisResult]:
+        """Extract and analyze the resume with a single Gemini call.
+
+        Expects {"resume_data": ..., "university_context": ...}. The analysis is
+        validated against the analyzer's fallback defaults, so downstream stages
+        see the same shape as in the two-call workflow. Results share the
+        extraction cache, keyed additionally by the university context (it is part
+        of the prompt); they never satisfy a plain extraction lookup or vice versa.
         """
+        print("📄 Extractor: Processing resume (fused extraction + analysis)")
 
-        response = self._query_gemini(prompt)
-        structured = self._parse_json_safely(response)
+        payload = self._read_payload(messages)
+        resume_data = payload.get("resume_data", {})
+        university_context = payload.get("university_context", "")
+        pdf_bytes, content_hash = self._read_source(resume_data)
+
+        cache = get_extraction_cache()
+        cache_key = make_cache_key("extraction_fused", content_hash, self.fused_fingerprint, university_context)
+        cached = cache.get(cache_key) if cache is not None else None
+        annotate(cache_hit=cached is not None, request_bytes=len(pdf_bytes) if pdf_bytes is not None else 0)
+        if cached is not None:
+            print("📄 Extractor: Reusing cached extraction")
+            extraction, analysis = cached
+            return ExtractionResult.from_dict({**extraction, "cache_hit": True}), AnalysisResult.from_dict(analysis)
+
+        started = time.perf_counter()
+        raw_text = await self._read_text(resume_data, pdf_bytes)
+
+        prompt = FUSED_PROMPT.format(
+            analysis_schema=ANALYSIS_SCHEMA,
+            university_context=university_context,
+            raw_text=raw_text,
+        )
+        response = await self._query_gemini_async(prompt, validate=self._is_fused_response)
+        structured, analysis_data = self._split_fused(self._parse_json_safely(response))
+
+        extraction = ExtractionResult(
+            raw_text=raw_text,
+            structured_data=structured,
+            content_hash=content_hash,
+            extraction_time=round(time.perf_counter() - started, 4),
+        )
+        analysis = build_analysis_result(analysis_data)
+        if cache is not None and extraction.complete and analysis.complete:
+            cache.set(cache_key, [extraction.to_dict(), analysis.to_dict()])
 
-        return {
-            "raw_text": raw_text,
-            "structured_data": structured,
-            "extraction_status": "completed"
-        }
+        return extraction, analysis
@@ -1,8 +1,12 @@
-import json
-import requests
-from typing import Dict, Any, List
+import asyncio
+from typing import Dict, Any, List, Optional
 from .base_agent import BaseAgent
+from .messages import MatchResult
 from datetime import datetime
+from config import ADZUNA_COUNTRY, ADZUNA_MAX_CONCURRENCY
+from utils.adzuna_client import search_jobs, search_jobs_async
+from utils.gemini_client import is_error_response
+from utils.skill_matcher import SkillMatcher, get_skill_matcher
 
 # Mapping skill keywords to recommended roles
 RECOMMENDED_ROLE_MAP = {
@@ -20,13 +24,15 @@ RECOMMENDED_ROLE_MAP = {
     "Aws": "Cloud Engineer",
 }
 
+_ROLE_KEYS = {key.lower(): role for key, role in RECOMMENDED_ROLE_MAP.items()}
+_ROLE_MATCHER = SkillMatcher(_ROLE_KEYS)
+
+
 def recommend_roles(skills: List[str]) -> List[str]:
-    roles = set()
+    roles = {}
     for skill in skills:
-        skill_lower = skill.lower()
-        for key, role in RECOMMENDED_ROLE_MAP.items():
-            if key.lower() in skill_lower:
-                roles.add(role)
+        for _, _, key in _ROLE_MATCHER.finditer(skill):
+            roles.setdefault(_ROLE_KEYS[key], None)
     return list(roles)[:5]
 
 class MatcherAgent(BaseAgent):
@@ -38,20 +44,20 @@ class MatcherAgent(BaseAgent):
             Provide detailed reasoning and compatibility scores.
             Return matches in JSON format with title, match_score, and location fields."""
         )
-        self.adzuna_app_id = ""  # Fill from secrets if needed
-        self.adzuna_app_key = ""
-        self.country = "in"
+        self.country = ADZUNA_COUNTRY
+        self.max_concurrency = ADZUNA_MAX_CONCURRENCY
 
-    async def run(self, messages: list) -> Dict[str, Any]:
+    async def run(self, messages: list) -> MatchResult:
         print("🎯 Matcher: Finding suitable job matches")
 
         try:
-            content = messages[-1].get("content", "{}").replace("'", '"')
-            analysis_results = json.loads(content)
-        except json.JSONDecodeError as e:
+            payload = self._read_payload(messages)
+        except (TypeError, ValueError, SyntaxError) as e:
             print(f"❌ Error parsing analysis results: {e}")
             return self._empty_result()
 
+        # Orchestrator sends {"analysis": AnalysisResult, ...}; standalone callers may pass the analysis itself
+        analysis_results = payload.get("analysis", payload)
         skills_analysis = analysis_results.get("skills_analysis", {})
         if not skills_analysis:
             print("⚠️ No skills analysis provided.")
@@ -59,9 +65,9 @@ class MatcherAgent(BaseAgent):
 
         skills = skills_analysis.get("technical_skills", [])
         experience_level = skills_analysis.get("experience_level", "Mid-level")
-        education_field = analysis_results.get("education", {}).get("field", "")
-        achievements = analysis_results.get("key_achievements", [])
-        domains = analysis_results.get("domain_expertise", [])
+        education_field = (skills_analysis.get("education") or {}).get("field", "")
+        achievements = skills_analysis.get("key_achievements", [])
+        domains = analysis_results.get("domain_expertise") or skills_analysis.get("domain_expertise", [])
 
         if not isinstance(skills, list):
             skills = []
@@ -73,6 +79,18 @@ class MatcherAgent(BaseAgent):
         keywords = [kw for kw in keywords if isinstance(kw, str)]
         print(f"🔍 Search keywords used: {keywords}")
 
+        # Skill and domain searches do not depend on the recommended roles, so start them
+        # now and let them run while Gemini is thinking
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        errors: List[str] = []  # failed searches make the result partial (not checkpointed)
+        skills_task = asyncio.create_task(
+            self.fetch_jobs_from_adzuna_async(skills, results_per_page=20, semaphore=semaphore, errors=errors)
+        )
+        domain_tasks = [
+            asyncio.create_task(self.fetch_jobs_for_domain_async(domain, semaphore=semaphore, errors=errors))
+            for domain in domains
+        ]
+
         # Use Gemini to recommend roles
         gemini_prompt = f"""
         Based on the following candidate keywords, experience level, and domains, recommend 3-5 ideal job roles.
@@ -86,20 +104,31 @@ class MatcherAgent(BaseAgent):
             "recommended_roles": ["Job Role 1", "Job Role 2", ...]
         }}
         """
-        gemini_response = self._query_gemini(gemini_prompt)
+        gemini_response = await self._query_gemini_async(
+            gemini_prompt, validate=lambda text: "recommended_roles" in self._parse_json_safely(text)
+        )
         parsed_roles = self._parse_json_safely(gemini_response)
+        if is_error_response(gemini_response):
+            errors.append(f"Gemini: {gemini_response[:200]}")
 
         recommended_roles_list = parsed_roles.get("recommended_roles", recommend_roles(keywords))
         print(f"💡 Recommended Roles: {recommended_roles_list}")
 
-        matching_jobs = self.fetch_jobs_from_adzuna(skills, results_per_page=20)
+        role_results = await asyncio.gather(*[
+            self.fetch_jobs_from_adzuna_async([role], results_per_page=5, semaphore=semaphore, errors=errors)
+            for role in recommended_roles_list
+        ])
+        matching_jobs = await skills_task
+        domain_results = await asyncio.gather(*domain_tasks)
+
         scored_jobs = []
+        skill_matcher = get_skill_matcher(tuple(sorted({s.lower() for s in skills if isinstance(s, str)})))
+        required_skills = len(skill_matcher.patterns)
 
         for job in matching_jobs:
-            description_text = (job.get("title", "") + " " + job.get("description", "")).lower()
-            required_skills = set(map(str.lower, skills))
-            overlap = sum(1 for skill in required_skills if skill in description_text)
-            match_score = int((overlap / len(required_skills)) * 100) if required_skills else 0
+            description_text = (job.get("title") or "") + " " + (job.get("description") or "")
+            overlap = len(skill_matcher.find_all(description_text))
+            match_score = int((overlap / required_skills) * 100) if required_skills else 0
 
             scored_jobs.append({
                 "title": job.get("title"),
@@ -113,7 +142,9 @@ class MatcherAgent(BaseAgent):
         scored_jobs.sort(key=lambda x: int(x["match_score"].rstrip("%")), reverse=True)
 
         if not scored_jobs:
-            fallback_jobs = self.fetch_jobs_from_adzuna(skills, results_per_page=5)
+            fallback_jobs = await self.fetch_jobs_from_adzuna_async(
+                skills, results_per_page=5, semaphore=semaphore, errors=errors
+            )
             for job in fallback_jobs:
                 scored_jobs.append({
                     "title": job.get("title"),
@@ -125,9 +156,7 @@ class MatcherAgent(BaseAgent):
                 })
 
         role_job_map = {}
-        for role in recommended_roles_list:
-            print(f"🔍 Fetching jobs for role: {role}")
-            role_jobs = self.fetch_jobs_from_adzuna([role], results_per_page=5)
+        for role, role_jobs in zip(recommended_roles_list, role_results):
             role_job_map[role] = [
                 {
                     "title": job.get("title"),
@@ -139,36 +168,21 @@ class MatcherAgent(BaseAgent):
                 for job in role_jobs
             ]
 
-        domain_job_map = {}
-        for domain in domains:
-            jobs = self.fetch_jobs_for_domain(domain)
-            domain_job_map[domain] = jobs
+        domain_job_map = dict(zip(domains, domain_results))
 
-        return {
-            "matched_jobs": scored_jobs[:10],
-            "recommended_roles": role_job_map,
-            "domain_expertise": domains,
-            "domain_jobs": domain_job_map,
-            "match_timestamp": str(datetime.now().date()),
-            "number_of_matches": len(scored_jobs),
-        }
+        return MatchResult(
+            matched_jobs=scored_jobs[:10],
+            recommended_roles=role_job_map,
+            domain_expertise=domains,
+            domain_jobs=domain_job_map,
+            match_timestamp=str(datetime.now().date()),
+            number_of_matches=len(scored_jobs),
+            errors=errors,
+        )
 
     def fetch_jobs_from_adzuna(self, keywords: List[str], results_per_page: int = 10) -> List[Dict[str, Any]]:
-        search_term = " ".join(keywords)
-        url = f"https://api.adzuna.com/v1/api/jobs/{self.country}/search/1"
-        params = {
-            "app_id": self.adzuna_app_id,
-            "app_key": self.adzuna_app_key,
-            "what": search_term,
-            "results_per_page": results_per_page,
-            "content-type": "application/json",
-        }
-
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            return data.get("results", [])
+            return search_jobs(" ".join(keywords), results_per_page=results_per_page, country=self.country)
         except Exception as e:
             print(f"❌ Error calling Adzuna API: {e}")
             return []
@@ -176,12 +190,44 @@ class MatcherAgent(BaseAgent):
     def fetch_jobs_for_domain(self, domain: str) -> List[Dict[str, Any]]:
         return self.fetch_jobs_from_adzuna([domain], results_per_page=5)
 
-    def _empty_result(self) -> Dict[str, Any]:
-        return {
-            "matched_jobs": [],
-            "recommended_roles": {},
-            "domain_expertise": [],
-            "domain_jobs": {},
-            "match_timestamp": str(datetime.now().date()),
-            "number_of_matches": 0,
-        }
+    async def fetch_jobs_from_adzuna_async(
+        self,
+        keywords: List[str],
+        results_per_page: int = 10,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        errors: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Non-blocking Adzuna search over the shared connection pool, capped by `semaphore`.
+
+        Failures return no jobs and are appended to `errors` when given.
+        """
+        search_term = " ".join(keywords)
+        print(f"🔍 Fetching jobs for: {search_term}")
+        try:
+            return await search_jobs_async(
+                search_term,
+                results_per_page=results_per_page,
+                country=self.country,
+                semaphore=semaphore or asyncio.Semaphore(self.max_concurrency),
+            )
+        except Exception as e:
+            print(f"❌ Error calling Adzuna API: {e}")
+            if errors is not None:
+                errors.append(f"Adzuna ({search_term}): {e}")
+            return []
+
+    async def fetch_jobs_for_domain_async(
+        self, domain: str, semaphore: Optional[asyncio.Semaphore] = None, errors: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        return await self.fetch_jobs_from_adzuna_async(
+            [domain], results_per_page=5, semaphore=semaphore, errors=errors
+        )
+
+    def _empty_result(self) -> MatchResult:
+        return MatchResult(
+            matched_jobs=[],
+            recommended_roles={},
+            domain_expertise=[],
+            domain_jobs={},
+            match_timestamp=str(datetime.now().date()),
+        )
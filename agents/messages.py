@@ -0,0 +1,113 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.gemini_client import is_error_response
+
+
+class StageOutput(Mapping):
+    """Base for stage results: attribute access, plus read-only dict-style access for the UI"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return (f.name for f in fields(self))
+
+    def __len__(self) -> int:
+        return len(fields(self))
+
+    @property
+    def complete(self) -> bool:
+        """False when the stage fell back to placeholder output (e.g. a proxy error), so it is not checkpointed"""
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "StageOutput":
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+
+@dataclass(slots=True)
+class ExtractionResult(StageOutput):
+    raw_text: str
+    structured_data: Dict[str, Any]
+    extraction_status: str = "completed"
+    content_hash: str = ""
+    extraction_time: float = 0.0
+    cache_hit: bool = False
+
+    @property
+    def complete(self) -> bool:
+        return self.extraction_status == "completed" and "error" not in self.structured_data
+
+
+@dataclass(slots=True)
+class AnalysisResult(StageOutput):
+    skills_analysis: Dict[str, Any]
+    analysis_timestamp: str
+    domain_expertise: List[str] = field(default_factory=list)
+    confidence_score: float = 0.5
+
+    @property
+    def complete(self) -> bool:
+        # The analyzer reports its fallback defaults with the base confidence
+        return self.confidence_score > 0.5
+
+
+@dataclass(slots=True)
+class MatchResult(StageOutput):
+    matched_jobs: List[Dict[str, Any]]
+    recommended_roles: Dict[str, List[Dict[str, Any]]]
+    domain_expertise: List[str]
+    domain_jobs: Dict[str, List[Dict[str, Any]]]
+    match_timestamp: str
+    number_of_matches: int = 0
+    errors: List[str] = field(default_factory=list)  # failed job searches; the result is then partial
+
+    @property
+    def complete(self) -> bool:
+        return not self.errors
+
+
+@dataclass(slots=True)
+class ScreeningResult(StageOutput):
+    screening_report: str
+    screening_timestamp: str
+    screening_score: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return not is_error_response(self.screening_report)
+
+
+@dataclass(slots=True)
+class RecommendationResult(StageOutput):
+    final_recommendation: str
+    recommendation_timestamp: str
+    confidence_level: str = "low"
+
+    @property
+    def complete(self) -> bool:
+        return not is_error_response(self.final_recommendation)
+
+
+@dataclass(slots=True)
+class AgentMessage:
+    """Envelope handed from the orchestrator to an agent.
+
+    `payload` holds references to earlier stage outputs; nothing is copied or
+    stringified until it crosses a process boundary (LLM prompt, cache, file).
+    """
+
+    sender: str
+    payload: Dict[str, Any]
+    recipient: Optional[str] = None
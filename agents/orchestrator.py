@@ -1,8 +1,25 @@
-from typing import Dict, Any
+import time
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
+from config import FUSED_EXTRACTION, GEMINI_MODEL
+from utils.cache import make_cache_key
+from utils.checkpoints import get_checkpoint_store
+from utils.exceptions import PipelineStageError
+from utils.tracing import span
+
 from .base_agent import BaseAgent
-from .extractor_agent import ExtractorAgent
+from .messages import (
+    AgentMessage,
+    AnalysisResult,
+    ExtractionResult,
+    MatchResult,
+    RecommendationResult,
+    ScreeningResult,
+)
+from .pipeline import Pipeline, Stage
+from .extractor_agent import ExtractorAgent, resume_content_hash
 from .analyzer_agent import AnalyzerAgent
 from .matcher_agent import MatcherAgent
 from .screener_agent import ScreenerAgent
@@ -10,13 +27,15 @@ from .recommender_agent import RecommenderAgent
 
 
 class OrchestratorAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, fused: Optional[bool] = None):
+        """`fused` runs extraction and analysis as one Gemini call (defaults to FUSED_EXTRACTION)"""
         super().__init__(
             name="Orchestrator",
             instructions="""Coordinate the recruitment workflow and delegate tasks to specialized agents.
             Ensure proper flow of information between extraction, analysis, matching, screening, and recommendation phases.
             Maintain context and aggregate results from each stage."""
         )
+        self.fused = FUSED_EXTRACTION if fused is None else fused
         self._setup_agents()
 
     def _setup_agents(self):
@@ -31,12 +50,141 @@ class OrchestratorAgent(BaseAgent):
         print("ℹ️ Orchestrator: Direct run() called – fallback mode")
         try:
             prompt = messages[-1]["content"]
-            response = self._query_gemini(prompt)
+            response = await self._query_gemini_async(prompt)
             return {"response": response, "timestamp": str(datetime.now().date())}
         except Exception as e:
             return {"error": str(e), "timestamp": str(datetime.now().date())}
 
-    async def process_application(self, resume_data: Dict[str, Any], university_context: str = "") -> Dict[str, Any]:
+    def _build_pipeline(self, stream_callbacks: Optional[Dict[str, Callable[[str], Any]]] = None) -> Pipeline:
+        """Declare the workflow as a DAG; screening only needs the analysis, so it overlaps matching.
+
+        `stream_callbacks` maps "screening" / "recommendation" to a function that
+        receives the generated text so far, for incremental rendering.
+        """
+        stream_callbacks = stream_callbacks or {}
+        return Pipeline([
+            *self._profile_stages(),
+            Stage(
+                "matching",
+                self._run_matching,
+                ("analysis_results", "university_context"),
+                "job_matches",
+                MatchResult.from_dict,
+                self._stage_version(self.matcher),
+            ),
+            Stage(
+                "screening",
+                partial(self._run_screening, on_update=stream_callbacks.get("screening")),
+                ("university_context", "extracted_data", "analysis_results"),
+                "screening_results",
+                ScreeningResult.from_dict,
+                self._stage_version(self.screener),
+            ),
+            Stage(
+                "recommendation",
+                partial(self._run_recommendation, on_update=stream_callbacks.get("recommendation")),
+                (
+                    "university_context",
+                    "extracted_data",
+                    "analysis_results",
+                    "job_matches",
+                    "screening_results",
+                ),
+                "final_recommendation",
+                RecommendationResult.from_dict,
+                self._stage_version(self.recommender),
+            ),
+        ], checkpoints=get_checkpoint_store())
+
+    def _profile_stages(self) -> List[Stage]:
+        """Stages producing `extracted_data` and `analysis_results`: two calls, or one fused call"""
+        if self.fused:
+            return [
+                Stage(
+                    "extraction_analysis",
+                    self._run_extraction_analysis,
+                    ("resume_data", "university_context"),
+                    ("extracted_data", "analysis_results"),
+                    lambda saved: (ExtractionResult.from_dict(saved[0]), AnalysisResult.from_dict(saved[1])),
+                    self.extractor.fused_fingerprint,
+                ),
+            ]
+        return [
+            Stage(
+                "extraction",
+                self._run_extraction,
+                ("resume_data",),
+                "extracted_data",
+                ExtractionResult.from_dict,
+                self.extractor.template_fingerprint,
+            ),
+            Stage(
+                "analysis",
+                self._run_analysis,
+                ("extracted_data", "university_context"),
+                "analysis_results",
+                AnalysisResult.from_dict,
+                self._stage_version(self.analyzer),
+            ),
+        ]
+
+    @staticmethod
+    def _stage_version(agent: BaseAgent) -> str:
+        """Checkpoint fingerprint of an agent: its output changes with the model or instructions"""
+        return make_cache_key(GEMINI_MODEL, agent.instructions)[:16]
+
+    def _message(self, payload: Dict[str, Any]) -> AgentMessage:
+        # Stage outputs travel by reference; in-memory PDF bytes are never stringified
+        return AgentMessage(sender=self.name, payload=payload)
+
+    async def _run_extraction(self, inputs: Dict[str, Any]) -> ExtractionResult:
+        return await self.extractor.run(
+            [{"role": "user", "content": self._message(inputs["resume_data"])}]
+        )
+
+    async def _run_extraction_analysis(self, inputs: Dict[str, Any]) -> Tuple[ExtractionResult, AnalysisResult]:
+        return await self.extractor.run_fused(
+            [{"role": "user", "content": self._message(inputs)}]
+        )
+
+    async def _run_analysis(self, inputs: Dict[str, Any]) -> AnalysisResult:
+        analysis_input = {
+            "extracted_resume": inputs["extracted_data"],
+            "university_context": inputs["university_context"],
+        }
+        return await self.analyzer.run(
+            [{"role": "user", "content": self._message(analysis_input)}]
+        )
+
+    async def _run_matching(self, inputs: Dict[str, Any]) -> MatchResult:
+        matcher_input = {
+            "analysis": inputs["analysis_results"],
+            "university_context": inputs["university_context"],
+        }
+        return await self.matcher.run(
+            [{"role": "user", "content": self._message(matcher_input)}]
+        )
+
+    async def _run_screening(
+        self, inputs: Dict[str, Any], on_update: Optional[Callable[[str], Any]] = None
+    ) -> ScreeningResult:
+        return await self.screener.run(
+            [{"role": "user", "content": self._message(inputs)}], on_update=on_update
+        )
+
+    async def _run_recommendation(
+        self, inputs: Dict[str, Any], on_update: Optional[Callable[[str], Any]] = None
+    ) -> RecommendationResult:
+        return await self.recommender.run(
+            [{"role": "user", "content": self._message(inputs)}], on_update=on_update
+        )
+
+    async def process_application(
+        self,
+        resume_data: Dict[str, Any],
+        university_context: str = "",
+        stream_callbacks: Optional[Dict[str, Callable[[str], Any]]] = None,
+    ) -> Dict[str, Any]:
         print("🎯 Orchestrator: Starting application process")
 
         workflow_context = {
@@ -44,49 +192,36 @@ class OrchestratorAgent(BaseAgent):
             "university_context": university_context,
             "status": "initiated",
             "current_stage": "extraction",
+            "stage_timings": {},
         }
+        with span("pipeline", file_name=resume_data.get("file_name", "")) as root:
+            workflow_context["trace_id"] = root.trace_id
+            started = time.perf_counter()
 
-        try:
-            extracted_data = await self.extractor.run(
-                [{"role": "user", "content": str(resume_data)}]
-            )
-            workflow_context.update({"extracted_data": extracted_data, "current_stage": "analysis"})
-
-            analysis_input = {
-                "extracted_resume": extracted_data,
-                "university_context": university_context,
-            }
-            analysis_results = await self.analyzer.run(
-                [{"role": "user", "content": str(analysis_input)}]
-            )
-            workflow_context.update({"analysis_results": analysis_results, "current_stage": "matching"})
-
-            matcher_input = {
-                "skills_analysis": analysis_results,
-                "university_context": university_context,
-            }
-            job_matches = await self.matcher.run(
-                [{"role": "user", "content": str(matcher_input)}]
-            )
-            workflow_context.update({"job_matches": job_matches, "current_stage": "screening"})
-
-            screening_results = await self.screener.run(
-                [{"role": "user", "content": str(workflow_context)}]
-            )
-            workflow_context.update({"screening_results": screening_results, "current_stage": "recommendation"})
-
-            recommender_input = {
-                "context": workflow_context,
-                "university_context": university_context,
-            }
-            final_recommendation = await self.recommender.run(
-                [{"role": "user", "content": str(recommender_input)}]
-            )
-            workflow_context.update({"final_recommendation": final_recommendation, "status": "completed"})
-
-            return workflow_context
+            try:
+                # Completed stages are checkpointed per resume, so a rerun after a failure resumes there
+                await self._build_pipeline(stream_callbacks).execute(
+                    workflow_context, workflow_context["stage_timings"], run_id=resume_content_hash(resume_data)
+                )
+                workflow_context.update({"status": "completed", "current_stage": "completed"})
+                return workflow_context
 
-        except Exception as e:
-            workflow_context.update({"status": "failed", "error": str(e)})
-            print(f"❌ Orchestration Error: {e}")
-            return workflow_context
+            except PipelineStageError as e:
+                workflow_context.update({"status": "failed", "current_stage": e.stage, "error": str(e.error)})
+                print(f"❌ Orchestration Error in {e.stage}: {e.error}")
+                return workflow_context
+
+            except Exception as e:
+                workflow_context.update({"status": "failed", "error": str(e)})
+                print(f"❌ Orchestration Error: {e}")
+                return workflow_context
+
+            finally:
+                workflow_context["total_duration"] = round(time.perf_counter() - started, 4)
+                # Keep the raw upload out of the returned context (it is saved and displayed)
+                workflow_context["resume_data"] = {
+                    key: value for key, value in resume_data.items() if key != "file_bytes"
+                }
+                root.set(status=workflow_context["status"])
+                if "error" in workflow_context:
+                    root.fail(workflow_context["error"])
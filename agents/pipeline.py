@@ -0,0 +1,131 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from utils.checkpoints import CheckpointStore
+from utils.exceptions import PipelineStageError
+from utils.tracing import span
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A pipeline step: reads `inputs` from the context and writes its result to `output`.
+
+    A fused stage names several outputs and returns a tuple with one value per key.
+
+    Stages with a `restore` function are checkpointed: `restore` rebuilds the
+    output from its saved dict, and `version` (prompt/model fingerprint) is part
+    of the checkpoint key so a changed stage never replays stale output.
+    """
+
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    inputs: Tuple[str, ...]
+    output: Union[str, Tuple[str, ...]]
+    restore: Optional[Callable[[Dict[str, Any]], Any]] = None
+    version: str = ""
+
+    @property
+    def outputs(self) -> Tuple[str, ...]:
+        return (self.output,) if isinstance(self.output, str) else tuple(self.output)
+
+    def complete(self, result: Any) -> bool:
+        """False if any output is a degraded placeholder, which must not be checkpointed"""
+        values = (result,) if isinstance(self.output, str) else result
+        return all(getattr(value, "complete", True) for value in values)
+
+
+class Pipeline:
+    """Runs stages as a dependency DAG, starting each one as soon as its inputs exist"""
+
+    def __init__(self, stages: Iterable[Stage], checkpoints: Optional[CheckpointStore] = None):
+        self.stages: List[Stage] = list(stages)
+        self.checkpoints = checkpoints
+        self._validate()
+
+    def _validate(self):
+        names = [stage.name for stage in self.stages]
+        outputs = [key for stage in self.stages for key in stage.outputs]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate stage names in pipeline: {names}")
+        if len(set(outputs)) != len(outputs):
+            raise ValueError(f"Several stages write the same output: {outputs}")
+
+        # Kahn's algorithm over the internally produced keys to reject cycles up front
+        producers = {key: stage.name for stage in self.stages for key in stage.outputs}
+        deps = {
+            stage.name: {producers[key] for key in stage.inputs if key in producers}
+            for stage in self.stages
+        }
+        resolved = set()
+        while len(resolved) < len(deps):
+            ready = [name for name, needs in deps.items() if name not in resolved and needs <= resolved]
+            if not ready:
+                raise ValueError(f"Pipeline has a dependency cycle among: {sorted(set(deps) - resolved)}")
+            resolved.update(ready)
+
+    async def _run_stage(self, stage: Stage, inputs: Dict[str, Any], run_id: Optional[str]) -> Any:
+        with span(f"stage.{stage.name}") as current:
+            if self.checkpoints is None or run_id is None or stage.restore is None:
+                return await stage.run(inputs)
+
+            key = self.checkpoints.key(run_id, stage.name, stage.version, inputs)
+            saved = self.checkpoints.load(key)
+            current.set(cache_hit=saved is not None)
+            if saved is not None:
+                return stage.restore(saved)
+
+            result = await stage.run(inputs)
+            # Degraded outputs (proxy errors, fallback defaults) are not saved, so a rerun retries them
+            if stage.complete(result):
+                self.checkpoints.save(key, result)
+            return result
+
+    async def execute(
+        self,
+        context: Dict[str, Any],
+        timings: Optional[Dict[str, Dict[str, float]]] = None,
+        run_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Execute all stages with maximal concurrency, storing outputs in `context`.
+
+        With a checkpoint store and a `run_id` (the resume's content hash),
+        checkpointed stages whose inputs are unchanged are restored instead of run.
+        """
+        timings = {} if timings is None else timings
+        pending = list(self.stages)
+        running: Dict[asyncio.Task, Tuple[Stage, float]] = {}
+        origin = time.perf_counter()
+
+        try:
+            while pending or running:
+                for stage in [s for s in pending if all(key in context for key in s.inputs)]:
+                    pending.remove(stage)
+                    inputs = {key: context[key] for key in stage.inputs}
+                    task = asyncio.create_task(self._run_stage(stage, inputs, run_id), name=stage.name)
+                    running[task] = (stage, time.perf_counter())
+
+                if not running:
+                    missing = {key for s in pending for key in s.inputs if key not in context}
+                    raise PipelineStageError(pending[0].name, KeyError(f"Missing pipeline inputs: {sorted(missing)}"))
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage, started = running.pop(task)
+                    finished = time.perf_counter()
+                    timings[stage.name] = {
+                        "start": round(started - origin, 4),
+                        "duration": round(finished - started, 4),
+                    }
+                    if task.exception() is not None:
+                        raise PipelineStageError(stage.name, task.exception()) from task.exception()
+                    if isinstance(stage.output, str):
+                        context[stage.output] = task.result()
+                    else:
+                        context.update(zip(stage.output, task.result()))
+        finally:
+            for task in running:
+                task.cancel()
+
+        return context
@@ -0,0 +1,122 @@
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Optional
+
+from utils.serialization import dumps_str
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Resume fields that never help screening or recommendations (mostly PII)
+_DROPPED_FIELDS = ("contact", "email", "phone", "address", "linkedin", "raw_text")
+
+# Progressively tighter (max list items, max string chars) caps tried until the context fits
+_SHRINK_STEPS = ((None, None), (10, 1200), (6, 600), (4, 300), (3, 150), (2, 80), (1, 40))
+
+# Sections dropped whole, least useful first, when even the tightest caps do not fit
+_DROP_ORDER = ("university_context", "resume", "top_jobs", "recommended_roles", "screening", "analysis")
+
+_TOP_JOBS = 5
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local estimate of LLM tokens: one per word or symbol, plus one per 6 chars of long words"""
+    return sum(1 + len(token) // 6 for token in _TOKEN_RE.findall(text))
+
+
+def _get(data: Any, key: str, default: Any = None) -> Any:
+    return data.get(key, default) if isinstance(data, Mapping) else default
+
+
+def _project(data: Any, drop: Iterable[str] = _DROPPED_FIELDS) -> Any:
+    """Copy `data` without fields whose name contains any of `drop`"""
+    if isinstance(data, Mapping):
+        return {
+            key: _project(value, drop)
+            for key, value in data.items()
+            if not any(part in str(key).lower() for part in drop)
+        }
+    if isinstance(data, (list, tuple)):
+        return [_project(item, drop) for item in data]
+    return data
+
+
+def _dedupe(value: Any, seen: set) -> Any:
+    """Drop empty values and list entries already emitted earlier in the context"""
+    if isinstance(value, Mapping):
+        result = {key: _dedupe(item, seen) for key, item in value.items()}
+        return {key: item for key, item in result.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        result = []
+        for item in value:
+            if isinstance(item, str):
+                marker = item.strip().lower()
+                if not marker or marker in seen:
+                    continue
+                seen.add(marker)
+                result.append(item)
+            else:
+                item = _dedupe(item, seen)
+                if item not in (None, "", [], {}) and item not in result:
+                    result.append(item)
+        return result
+    return value
+
+
+def _truncate(value: Any, max_items: Optional[int], max_chars: Optional[int]) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _truncate(item, max_items, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        items = value if max_items is None else value[:max_items]
+        return [_truncate(item, max_items, max_chars) for item in items]
+    if isinstance(value, str) and max_chars is not None and len(value) > max_chars:
+        return value[:max_chars].rstrip() + "…"
+    return value
+
+
+def build_prompt_context(view: Dict[str, Any], budget: int) -> str:
+    """Serialize a projected view compactly, dedupe it and shrink it to fit `budget` estimated tokens"""
+    view = _dedupe(view, set())
+    for max_items, max_chars in _SHRINK_STEPS:
+        text = dumps_str(_truncate(view, max_items, max_chars))
+        if estimate_tokens(text) <= budget:
+            return text
+    # Still over budget after the tightest caps: drop whole sections, so the result stays valid JSON
+    max_items, max_chars = _SHRINK_STEPS[-1]
+    drop_order = [key for key in _DROP_ORDER if key in view]
+    drop_order += [key for key in reversed(list(view)) if key not in drop_order]
+    for key in drop_order:
+        view = {name: value for name, value in view.items() if name != key}
+        text = dumps_str(_truncate(view, max_items, max_chars))
+        if estimate_tokens(text) <= budget:
+            return text
+    return text
+
+
+def screener_view(context: Mapping) -> Dict[str, Any]:
+    """What the Screener needs: the analysis, the parsed resume without raw text or contact details, and the curriculum"""
+    analysis = _get(context, "analysis_results", {})
+    return {
+        "analysis": _project(_get(analysis, "skills_analysis", {})),
+        "resume": _project(_get(_get(context, "extracted_data", {}), "structured_data", {})),
+        "university_context": _get(context, "university_context", ""),
+    }
+
+
+def recommender_view(context: Mapping) -> Dict[str, Any]:
+    """What the Recommender needs: the analysis, the top jobs and roles (no URLs) and the screening outcome"""
+    analysis = _get(context, "analysis_results", {})
+    matches = _get(context, "job_matches", {})
+    screening = _get(context, "screening_results", {})
+    return {
+        "analysis": _project(_get(analysis, "skills_analysis", {})),
+        "top_jobs": [
+            {key: job.get(key) for key in ("title", "company", "match_score")}
+            for job in (_get(matches, "matched_jobs") or [])[:_TOP_JOBS]
+        ],
+        "recommended_roles": list(_get(matches, "recommended_roles") or {}),
+        "screening": {
+            "score": _get(screening, "screening_score"),
+            "report": _get(screening, "screening_report", ""),
+        },
+        "university_context": _get(context, "university_context", ""),
+    }
@@ -1,6 +1,9 @@
-from typing import Dict, Any
+from typing import Any, Callable, Optional
 from datetime import datetime
 from .base_agent import BaseAgent
+from .messages import RecommendationResult
+from .prompt_context import build_prompt_context, recommender_view
+from config import RECOMMENDER_TOKEN_BUDGET
 
 
 class RecommenderAgent(BaseAgent):
@@ -20,25 +23,30 @@ class RecommenderAgent(BaseAgent):
             Return the recommendations in a well-structured paragraph."""
         )
 
-    async def run(self, messages: list) -> Dict[str, Any]:
-        """Generate final recommendations using Gemini"""
+    async def run(self, messages: list, on_update: Optional[Callable[[str], Any]] = None) -> RecommendationResult:
+        """Generate final recommendations using Gemini; `on_update` receives the text so far while it streams"""
         print("💡 Recommender: Generating final recommendations")
 
         try:
-            workflow_context = eval(messages[-1]["content"])
-            prompt = f"Candidate Data:\n{workflow_context}"
+            workflow_context = self._read_payload(messages)
+            workflow_context = workflow_context.get("context", workflow_context)
+            candidate_context = build_prompt_context(recommender_view(workflow_context), RECOMMENDER_TOKEN_BUDGET)
+            prompt = f"Candidate Data:\n{candidate_context}"
         except Exception as e:
             print(f"[Recommender Error] Invalid input: {e}")
-            return {
-                "final_recommendation": "Could not generate recommendation due to invalid input.",
-                "recommendation_timestamp": str(datetime.now().date()),
-                "confidence_level": "low"
-            }
+            return RecommendationResult(
+                final_recommendation="Could not generate recommendation due to invalid input.",
+                recommendation_timestamp=str(datetime.now().date()),
+                confidence_level="low",
+            )
 
-        recommendation = self._query_gemini(prompt)
+        if on_update is not None:
+            recommendation = await self._stream_gemini_async(prompt, on_update)
+        else:
+            recommendation = await self._query_gemini_async(prompt)
 
-        return {
-            "final_recommendation": recommendation.strip(),
-            "recommendation_timestamp": str(datetime.now().date()),
-            "confidence_level": "high"
-        }
+        return RecommendationResult(
+            final_recommendation=recommendation.strip(),
+            recommendation_timestamp=str(datetime.now().date()),
+            confidence_level="high",
+        )
@@ -1,6 +1,9 @@
-from typing import Dict, Any
+from typing import Any, Callable, Optional
 from datetime import datetime
 from .base_agent import BaseAgent
+from .messages import ScreeningResult
+from .prompt_context import build_prompt_context, screener_view
+from config import SCREENER_TOKEN_BUDGET
 
 
 class ScreenerAgent(BaseAgent):
@@ -18,26 +21,30 @@ class ScreenerAgent(BaseAgent):
             Mention if anything is missing or uncertain in the candidate's profile."""
         )
 
-    async def run(self, messages: list) -> Dict[str, Any]:
-        """Screen the candidate using Gemini"""
+    async def run(self, messages: list, on_update: Optional[Callable[[str], Any]] = None) -> ScreeningResult:
+        """Screen the candidate using Gemini; `on_update` receives the text so far while it streams"""
         print("👥 Screener: Conducting initial screening")
 
         try:
-            workflow_context = eval(messages[-1]["content"])
-            prompt = f"Candidate Profile Data:\n{workflow_context}"
+            workflow_context = self._read_payload(messages)
+            candidate_context = build_prompt_context(screener_view(workflow_context), SCREENER_TOKEN_BUDGET)
+            prompt = f"Candidate Profile Data:\n{candidate_context}"
         except Exception as e:
             print(f"[Screener Error] Invalid input: {e}")
-            return {
-                "screening_report": "Could not screen candidate due to input error.",
-                "screening_timestamp": str(datetime.now().date()),
-                "screening_score": 0
-            }
+            return ScreeningResult(
+                screening_report="Could not screen candidate due to input error.",
+                screening_timestamp=str(datetime.now().date()),
+                screening_score=0,
+            )
 
         # Use Gemini via proxy
-        screening_results = self._query_gemini(prompt)
+        if on_update is not None:
+            screening_results = await self._stream_gemini_async(prompt, on_update)
+        else:
+            screening_results = await self._query_gemini_async(prompt)
 
-        return {
-            "screening_report": screening_results.strip(),
-            "screening_timestamp": str(datetime.now().date()),
-            "screening_score": 85  # Optional: compute dynamically later
-        }
+        return ScreeningResult(
+            screening_report=screening_results.strip(),
+            screening_timestamp=str(datetime.now().date()),
+            screening_score=85,  # Optional: compute dynamically later
+        )
@@ -34,7 +34,7 @@ class UniversityAgent(BaseAgent):
             }
 
         # Compose full prompt and call Gemini via proxy
-        response_text = self._query_gemini(input_text)
+        response_text = await self._query_gemini_async(input_text)
 
         return {
             "formatted_output": response_text.strip(),
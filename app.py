@@ -1,12 +1,16 @@
 import streamlit as st
-import asyncio
-import os
-import requests
+import hashlib
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional
 from streamlit_option_menu import option_menu
+from config import GEMINI_PROXY_URL
 from agents.orchestrator import OrchestratorAgent
 from utils.logger import setup_logger
 from utils.exceptions import ResumeProcessingError
+from utils.adzuna_client import search_jobs
+from utils.cache import make_cache_key
+from utils.http_client import run_async
+from utils.serialization import dumps
 from university_app import render_university_interface
 from domain_job_search_demo import run_domain_job_search
 
@@ -25,8 +29,8 @@ st.set_page_config(
 # =============================
 logger = setup_logger()
 
-if "GEMINI_PROXY_URL" not in st.secrets:
-    st.error("❌ Gemini Proxy URL is not configured in Streamlit secrets.")
+if not GEMINI_PROXY_URL:
+    st.error("❌ Gemini Proxy URL is not configured in Streamlit secrets or the environment.")
     st.stop()
 
 # =============================
@@ -87,46 +91,72 @@ def main():
 
         if uploaded_file:
             try:
-                with st.spinner("Saving uploaded file..."):
-                    file_path = save_uploaded_file(uploaded_file)
+                # Hand the upload's in-memory buffer straight to the pipeline; nothing touches disk
+                file_bytes = uploaded_file.getvalue()
 
-                st.info("Resume uploaded successfully! Processing...")
+                # Widget interactions rerun this script: reuse the session's result for the same upload
+                session_results = st.session_state.setdefault("resume_results", {})
+                run_key = resume_run_key(file_bytes, university_context)
+                result = session_results.get(run_key)
 
-                progress_bar = st.progress(0)
+                if result is None:
+                    st.info("Resume uploaded successfully! Processing...")
+
+                progress_bar = st.progress(0 if result is None else 100)
                 status_text = st.empty()
 
                 try:
-                    status_text.text("Analyzing resume...")
-                    progress_bar.progress(25)
-
-                    result = asyncio.run(process_resume(file_path, university_context))
+                    # Tabs exist before the run so screening and recommendation text can stream into them
+                    tab1, tab3, tab4 = st.tabs(["📊 Analysis", "🌟 Screening", "💡 Recommendation"])
+
+                    with tab1:
+                        st.subheader("Skills Analysis")
+                        analysis_placeholder = st.empty()
+
+                    with tab3:
+                        st.subheader("Screening Results")
+                        screening_score_placeholder = st.empty()
+                        screening_placeholder = st.empty()
+
+                    with tab4:
+                        st.subheader("Final Recommendation")
+                        recommendation_placeholder = st.empty()
+
+                    if result is None:
+                        status_text.text("Analyzing resume...")
+                        progress_bar.progress(25)
+
+                        stream_callbacks = {
+                            "screening": screening_placeholder.markdown,
+                            "recommendation": lambda text: recommendation_placeholder.info(text, icon="💡"),
+                        }
+                        result = run_async(
+                            process_resume(file_bytes, university_context, uploaded_file.name, stream_callbacks)
+                        )
+
+                        if result["status"] == "completed":
+                            remember_result(session_results, run_key, result)
+
+                            output_dir = Path("results")
+                            output_dir.mkdir(exist_ok=True)
+                            output_file = output_dir / "analysis_output.json"
+                            output_file.write_bytes(dumps(result, indent=True))
+                            st.success(f"Results saved to: {output_file}")
 
                     if result["status"] == "completed":
                         progress_bar.progress(100)
                         status_text.text("Analysis complete!")
 
-                        tab1, tab3, tab4 = st.tabs(["📊 Analysis", "🌟 Screening", "💡 Recommendation"])
-
-                        with tab1:
-                            st.subheader("Skills Analysis")
+                        with analysis_placeholder.container():
                             st.write(result["analysis_results"]["skills_analysis"])
                             st.metric("Confidence Score", f"{result['analysis_results']['confidence_score']:.0%}")
 
-                        with tab3:
-                            st.subheader("Screening Results")
-                            st.metric("Screening Score", f"{result['screening_results']['screening_score']}%")
-                            st.write(result["screening_results"]["screening_report"])
+                        screening_score_placeholder.metric(
+                            "Screening Score", f"{result['screening_results']['screening_score']}%"
+                        )
+                        screening_placeholder.write(result["screening_results"]["screening_report"])
 
-                        with tab4:
-                            st.subheader("Final Recommendation")
-                            st.info(result["final_recommendation"]["final_recommendation"], icon="💡")
-
-                        output_dir = Path("results")
-                        output_dir.mkdir(exist_ok=True)
-                        output_file = output_dir / f"analysis_output.txt"
-                        with open(output_file, "w") as f:
-                            f.write(str(result))
-                        st.success(f"Results saved to: {output_file}")
+                        recommendation_placeholder.info(result["final_recommendation"]["final_recommendation"], icon="💡")
 
                     else:
                         st.error(f"Process failed at stage: {result['current_stage']}\nError: {result.get('error', 'Unknown error')}")
@@ -135,12 +165,6 @@ def main():
                     st.error(f"Error processing resume: {str(e)}")
                     logger.error(f"Processing error: {str(e)}", exc_info=True)
 
-                finally:
-                    try:
-                        os.remove(file_path)
-                    except Exception as e:
-                        logger.error(f"Error removing temporary file: {str(e)}")
-
             except Exception as e:
                 st.error(f"Error handling file upload: {str(e)}")
                 logger.error(f"Upload error: {str(e)}", exc_info=True)
@@ -233,45 +257,54 @@ def main():
 # =============================
 # UTILITY FUNCTIONS
 # =============================
-def save_uploaded_file(uploaded_file) -> str:
-    try:
-        save_dir = Path("uploads")
-        save_dir.mkdir(exist_ok=True)
-        file_path = save_dir / f"resume_uploaded_{uploaded_file.name}"
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        return str(file_path)
-    except Exception as e:
-        st.error(f"Error saving file: {str(e)}")
-        raise
-
 def fetch_adzuna_jobs(query, location="India", results_per_page=10):
-    from utils.constants import APP_ID, APP_KEY
-    url = f"https://api.adzuna.com/v1/api/jobs/in/search/1"
-    params = {
-        "app_id": APP_ID,
-        "app_key": APP_KEY,
-        "what": query,
-        "where": location,
-        "results_per_page": results_per_page,
-        "content-type": "application/json",
-    }
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json().get("results", [])
+        return search_jobs(query, where=location, results_per_page=results_per_page, country="in")
     except Exception as e:
         st.error(f"Error fetching jobs from Adzuna: {e}")
         return []
 
-async def process_resume(file_path: str, university_context: str = "") -> dict:
+MAX_SESSION_RESULTS = 8  # memoized pipeline results kept per browser session
+
+
+@st.cache_resource
+def get_orchestrator() -> OrchestratorAgent:
+    """One orchestrator (and set of agents) per server process, shared by every session and rerun.
+
+    Safe to share: agents hold no per-run state and stream callbacks are passed per call.
+    """
+    return OrchestratorAgent()
+
+
+def resume_run_key(file_bytes: bytes, university_context: str = "") -> str:
+    """Identifies one pipeline run: the same upload with the same curriculum context gives the same result"""
+    return make_cache_key(
+        hashlib.sha256(file_bytes).hexdigest(),
+        hashlib.sha256(university_context.encode("utf-8")).hexdigest(),
+    )
+
+
+def remember_result(session_results: Dict[str, dict], run_key: str, result: dict) -> None:
+    """Memoize a completed run for this session, dropping the oldest beyond MAX_SESSION_RESULTS"""
+    session_results[run_key] = result
+    while len(session_results) > MAX_SESSION_RESULTS:
+        session_results.pop(next(iter(session_results)))
+
+
+async def process_resume(
+    file_bytes: bytes,
+    university_context: str = "",
+    file_name: str = "",
+    stream_callbacks: Optional[Dict[str, Callable[[str], Any]]] = None,
+) -> dict:
     try:
-        orchestrator = OrchestratorAgent()
+        orchestrator = get_orchestrator()
         resume_data = {
-            "file_path": file_path,
+            "file_bytes": file_bytes,
+            "file_name": file_name,
             "submission_timestamp": "2025-7-5",  # Static fallback
         }
-        return await orchestrator.process_application(resume_data, university_context)
+        return await orchestrator.process_application(resume_data, university_context, stream_callbacks)
     except Exception as e:
         logger.error(f"Error processing resume: {str(e)}")
         raise
@@ -0,0 +1,220 @@
+"""Run the recruitment pipeline over many PDF resumes and write one JSONL record per candidate.
+
+    python batch_process.py resumes/ --workers 8 --rate 2 --output results/batch.jsonl
+    python batch_process.py "intake/2025-*/*.pdf" --university-context curriculum.txt
+"""
+import argparse
+import asyncio
+import glob
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from agents.orchestrator import OrchestratorAgent
+from utils.http_client import run_async
+from utils.limiter import RateLimiter
+from utils.serialization import dumps, loads
+
+SUMMARY_TOP_JOBS = 5  # matched jobs kept per record
+
+def collect_resumes(inputs: List[str]) -> List[Path]:
+    """Expand directories (PDFs inside, recursively) and glob patterns into a sorted, de-duplicated list"""
+    paths = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.update(p for p in path.rglob("*") if p.suffix.lower() == ".pdf")
+        else:
+            paths.update(Path(match) for match in glob.glob(item, recursive=True) if match.lower().endswith(".pdf"))
+    return sorted(paths)
+
+
+def summary_view(result: Mapping) -> Dict[str, Any]:
+    """Compact record of a finished run: scores, analysis and reports, without the parsed resume.
+
+    The resume section (name, contact details, work history), raw text and PDF bytes
+    are never written. The screening and recommendation reports are free text from
+    Gemini and may still name the candidate, so treat the output as personal data.
+    """
+    matches = result.get("job_matches") or {}
+    analysis = result.get("analysis_results") or {}
+    screening = result.get("screening_results") or {}
+    recommendation = result.get("final_recommendation") or {}
+    return {
+        "status": result.get("status"),
+        "current_stage": result.get("current_stage"),
+        "error": result.get("error"),
+        "trace_id": result.get("trace_id"),
+        "total_duration": result.get("total_duration"),
+        "stage_timings": result.get("stage_timings", {}),
+        "analysis": analysis.get("skills_analysis", {}),
+        "top_jobs": [
+            {key: job.get(key) for key in ("title", "company", "location", "match_score", "url")}
+            for job in (matches.get("matched_jobs") or [])[:SUMMARY_TOP_JOBS]
+        ],
+        "recommended_roles": list(matches.get("recommended_roles") or {}),
+        "job_search_errors": list(matches.get("errors") or []),
+        "screening": {
+            "score": screening.get("screening_score"),
+            "report": screening.get("screening_report", ""),
+        },
+        "recommendation": recommendation.get("final_recommendation", ""),
+    }
+
+
+def compact_output(output: Path) -> int:
+    """Keep only the latest record per file (a retried resume replaces its failed record); returns records kept"""
+    if not output.exists():
+        return 0
+    latest = {}
+    with open(output, "rb") as fp:
+        for line in fp:
+            try:
+                record = loads(line)
+            except ValueError:
+                continue
+            latest.pop(record.get("file"), None)  # re-insert so the file keeps processing order
+            latest[record.get("file")] = line.rstrip(b"\n")
+    temp = output.with_name(output.name + ".tmp")
+    with open(temp, "wb") as fp:
+        for line in latest.values():
+            fp.write(line + b"\n")
+    os.replace(temp, output)
+    return len(latest)
+
+
+def already_processed(output: Path) -> Set[str]:
+    """Files with a completed record in an existing output, so an interrupted run can resume"""
+    done = set()
+    if output.exists():
+        with open(output, "rb") as fp:
+            for line in fp:
+                try:
+                    record = loads(line)
+                except ValueError:
+                    continue
+                if record.get("status") == "completed":
+                    done.add(record.get("file"))
+    return done
+
+
+class Progress:
+    def __init__(self, total: int, every: float = 5.0):
+        self.total = total
+        self.every = every
+        self.completed = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self.ended: Optional[float] = None
+        self._last_report = self.started
+
+    @property
+    def elapsed(self) -> float:
+        return (self.ended or time.perf_counter()) - self.started
+
+    def record(self, status: str) -> None:
+        if status == "completed":
+            self.completed += 1
+        else:
+            self.failed += 1
+        now = time.perf_counter()
+        if now - self._last_report >= self.every or self.completed + self.failed == self.total:
+            self._last_report = now
+            self.report()
+
+    def report(self) -> None:
+        finished = self.completed + self.failed
+        elapsed = self.elapsed
+        rate = finished / elapsed if elapsed else 0.0
+        eta = (self.total - finished) / rate if rate else 0.0
+        print(
+            f"[{finished}/{self.total}] {self.completed} ok, {self.failed} failed | "
+            f"{rate * 60:.1f} resumes/min | elapsed {elapsed:.0f}s | eta {eta:.0f}s",
+            file=sys.stderr,
+        )
+
+
+async def run_batch(
+    paths: List[Path],
+    output: Path,
+    workers: int = 4,
+    rate: float = 0.0,
+    university_context: str = "",
+) -> Progress:
+    """Process `paths` with `workers` concurrent pipelines, starting at most `rate` resumes per second"""
+    orchestrator = OrchestratorAgent()
+    limiter = RateLimiter(rate)
+    queue: asyncio.Queue = asyncio.Queue()
+    for path in paths:
+        queue.put_nowait(path)
+    progress = Progress(len(paths))
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output, "ab") as out:
+
+        async def worker() -> None:
+            while True:
+                try:
+                    path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await limiter.wait()
+                try:
+                    resume_data = {
+                        "file_bytes": await asyncio.to_thread(path.read_bytes),
+                        "file_name": path.name,
+                        "submission_timestamp": time.strftime("%Y-%m-%d"),
+                    }
+                    result = await orchestrator.process_application(resume_data, university_context)
+                except Exception as e:
+                    result = {"status": "failed", "error": str(e)}
+                # A compact summary only: no parsed resume, raw text or PDF bytes
+                out.write(dumps({"file": str(path), **summary_view(result)}) + b"\n")
+                out.flush()
+                progress.record(result.get("status"))
+
+        await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+        progress.ended = time.perf_counter()
+    return progress
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Batch-process PDF resumes through the recruitment pipeline")
+    parser.add_argument("inputs", nargs="+", help="directories and/or glob patterns of PDF resumes")
+    parser.add_argument(
+        "--output", default="results/batch_results.jsonl", help="JSONL file of records, one per resume (latest wins)"
+    )
+    parser.add_argument("--workers", type=int, default=4, help="resumes processed concurrently")
+    parser.add_argument("--rate", type=float, default=0.0, help="max resumes started per second (0 = unlimited)")
+    parser.add_argument("--university-context", default=None, help="text file with curriculum context")
+    parser.add_argument("--no-resume", action="store_true", help="reprocess files already completed in --output")
+    args = parser.parse_args(argv)
+
+    output = Path(args.output)
+    paths = collect_resumes(args.inputs)
+    if not args.no_resume:
+        done = already_processed(output)
+        paths = [path for path in paths if str(path) not in done]
+    if not paths:
+        print("No resumes to process.", file=sys.stderr)
+        return
+
+    university_context = Path(args.university_context).read_text(encoding="utf-8") if args.university_context else ""
+    print(f"Processing {len(paths)} resumes with {args.workers} workers -> {output}", file=sys.stderr)
+    progress = run_async(run_batch(paths, output, args.workers, args.rate, university_context))
+    compact_output(output)
+
+    elapsed = progress.elapsed
+    finished = progress.completed + progress.failed
+    print(
+        f"Done: {progress.completed} completed, {progress.failed} failed in {elapsed:.1f}s "
+        f"({finished / elapsed * 60:.1f} resumes/min)",
+        file=sys.stderr,
+    )
+
+
+# The PDF pool uses spawn, which re-imports this module in every worker: keep the guard
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,96 @@
 import os
 
 try:
-    import streamlit as st
-    GOOGLE_API_KEY = st.secrets["GOOGLE_API_KEY"]
-except Exception:
     from dotenv import load_dotenv
     load_dotenv()
-    GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
+except ImportError:
+    pass
+
+
+def get_setting(name: str, default=None):
+    """Read a setting from Streamlit secrets, falling back to environment variables"""
+    try:
+        import streamlit as st
+        if name in st.secrets:
+            return st.secrets[name]
+    except Exception:
+        pass
+    return os.getenv(name, default)
+
+
+def get_bool_setting(name: str, default: bool = False) -> bool:
+    value = get_setting(name, default)
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+GOOGLE_API_KEY = get_setting("GOOGLE_API_KEY")
+
+# Gemini proxy (point GEMINI_PROXY_URL at a local stand-in for benchmarking)
+GEMINI_PROXY_URL = get_setting("GEMINI_PROXY_URL", "https://proxy-server-m0x4.onrender.com/gemini")
+GEMINI_TIMEOUT = float(get_setting("GEMINI_TIMEOUT", 60))
+GEMINI_CONNECT_TIMEOUT = float(get_setting("GEMINI_CONNECT_TIMEOUT", 10))
+GEMINI_MODEL = get_setting("GEMINI_MODEL", "gemini-1.5-flash")
+GEMINI_PROXY_BATCH_URL = get_setting("GEMINI_PROXY_BATCH_URL", GEMINI_PROXY_URL.rstrip("/") + "/batch")
+GEMINI_PROXY_STREAM_URL = get_setting("GEMINI_PROXY_STREAM_URL", GEMINI_PROXY_URL.rstrip("/") + "/stream")
+GEMINI_BATCH_SIZE = int(get_setting("GEMINI_BATCH_SIZE", 50))
+GEMINI_BATCH_TIMEOUT = float(get_setting("GEMINI_BATCH_TIMEOUT", 300))
+GEMINI_MAX_RETRIES = int(get_setting("GEMINI_MAX_RETRIES", 2))  # retries after a 429 from the proxy
+GEMINI_RETRY_MAX_WAIT = float(get_setting("GEMINI_RETRY_MAX_WAIT", 5))
+
+# Shared HTTP connection pool
+HTTP_MAX_CONNECTIONS = int(get_setting("HTTP_MAX_CONNECTIONS", 20))
+HTTP_MAX_KEEPALIVE = int(get_setting("HTTP_MAX_KEEPALIVE", 10))
+
+# Adzuna job search
+ADZUNA_APP_ID = get_setting("ADZUNA_APP_ID", "")  # required for job search; never commit real values
+ADZUNA_APP_KEY = get_setting("ADZUNA_APP_KEY", "")
+ADZUNA_COUNTRY = get_setting("ADZUNA_COUNTRY", "in")
+ADZUNA_TIMEOUT = float(get_setting("ADZUNA_TIMEOUT", 10))
+ADZUNA_MAX_CONCURRENCY = int(get_setting("ADZUNA_MAX_CONCURRENCY", 6))
+ADZUNA_CACHE_TTL = float(get_setting("ADZUNA_CACHE_TTL", 6 * 3600))
+
+# PDF parsing
+PDF_MAX_WORKERS = int(get_setting("PDF_MAX_WORKERS", min(4, os.cpu_count() or 1)))
+PDF_MAX_PAGES = int(get_setting("PDF_MAX_PAGES", 50))
+
+# Local caches
+CACHE_DB_PATH = get_setting("CACHE_DB_PATH", "cache/cache.sqlite")
+LLM_CACHE_ENABLED = get_bool_setting("LLM_CACHE_ENABLED", True)
+LLM_CACHE_TTL = float(get_setting("LLM_CACHE_TTL", 7 * 24 * 3600))
+LLM_CACHE_MAX_MEMORY = int(get_setting("LLM_CACHE_MAX_MEMORY", 512))
+LLM_CACHE_MAX_DISK = int(get_setting("LLM_CACHE_MAX_DISK", 20000))
+EXTRACTION_CACHE_ENABLED = get_bool_setting("EXTRACTION_CACHE_ENABLED", True)
+EXTRACTION_CACHE_TTL = float(get_setting("EXTRACTION_CACHE_TTL", 30 * 24 * 3600))
+CHECKPOINTS_ENABLED = get_bool_setting("CHECKPOINTS_ENABLED", True)  # per-stage results, so reruns resume
+CHECKPOINT_TTL = float(get_setting("CHECKPOINT_TTL", 24 * 3600))
+
+# Fused mode: one Gemini call returns both the extracted resume and the skills analysis
+FUSED_EXTRACTION = get_bool_setting("FUSED_EXTRACTION", False)
+
+# Prompt context budgets (estimated tokens of candidate context per agent)
+SCREENER_TOKEN_BUDGET = int(get_setting("SCREENER_TOKEN_BUDGET", 1500))
+RECOMMENDER_TOKEN_BUDGET = int(get_setting("RECOMMENDER_TOKEN_BUDGET", 2000))
+
+# Gemini proxy server (proxy_gemini.py); point GEMINI_API_BASE at a fake server for load tests
+GEMINI_API_BASE = get_setting("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+PROXY_UPSTREAM_TIMEOUT = float(get_setting("PROXY_UPSTREAM_TIMEOUT", 55))
+PROXY_MAX_CONNECTIONS = int(get_setting("PROXY_MAX_CONNECTIONS", 100))
+PROXY_MAX_KEEPALIVE = int(get_setting("PROXY_MAX_KEEPALIVE", 20))
+PROXY_CACHE_TTL = float(get_setting("PROXY_CACHE_TTL", 3600))
+PROXY_CACHE_MAX_ENTRIES = int(get_setting("PROXY_CACHE_MAX_ENTRIES", 1024))
+PROXY_CONCURRENCY_INITIAL = int(get_setting("PROXY_CONCURRENCY_INITIAL", 8))
+PROXY_CONCURRENCY_MIN = int(get_setting("PROXY_CONCURRENCY_MIN", 1))
+PROXY_CONCURRENCY_MAX = int(get_setting("PROXY_CONCURRENCY_MAX", 64))
+PROXY_QUEUE_SIZE = int(get_setting("PROXY_QUEUE_SIZE", 200))
+PROXY_UPSTREAM_RETRIES = int(get_setting("PROXY_UPSTREAM_RETRIES", 2))  # requeues after an upstream 429/503
+PROXY_RETRY_AFTER_MAX = float(get_setting("PROXY_RETRY_AFTER_MAX", 10))  # cap on the upstream Retry-After wait before a requeue
+PROXY_BATCH_MAX_ITEMS = int(get_setting("PROXY_BATCH_MAX_ITEMS", 100))
+PROXY_BATCH_CONCURRENCY = int(get_setting("PROXY_BATCH_CONCURRENCY", 8))
+
+# Tracing: spans are appended to TRACE_FILE as JSONL (summarize with `python -m utils.tracing`)
+TRACING_ENABLED = get_bool_setting("TRACING_ENABLED", True)
+TRACE_FILE = get_setting("TRACE_FILE", "logs/traces.jsonl")
+TRACE_MAX_BYTES = int(get_setting("TRACE_MAX_BYTES", 50 * 1024 * 1024))  # rotate to traces.jsonl.1, .2, ...
+TRACE_BACKUPS = int(get_setting("TRACE_BACKUPS", 3))
@@ -1,130 +1,312 @@
 import sqlite3
+import threading
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional
 import json
 import os
 
+# Bump whenever schema.sql changes so existing databases are migrated once
+SCHEMA_VERSION = 2
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -65536",  # 64 MiB page cache
+    "PRAGMA mmap_size = 268435456",  # 256 MiB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 30000",
+)
+STATEMENT_CACHE_SIZE = 256
+BULK_BATCH_SIZE = 10000
+
+# Per-row index triggers that add_jobs_bulk(defer_index=True) suspends during a load
+DEFERRED_TRIGGERS = ("jobs_fts_insert", "jobs_skills_insert")
+
+BACKFILL_SKILLS_SQL = """
+INSERT OR IGNORE INTO skills (name)
+SELECT DISTINCT trim(json_each.value) FROM jobs, json_each(jobs.requirements)
+WHERE jobs.id > ? AND trim(json_each.value) <> ''
+"""
+
+BACKFILL_JOB_SKILLS_SQL = """
+INSERT OR IGNORE INTO job_skills (skill_id, job_id)
+SELECT skills.id, jobs.id FROM jobs, json_each(jobs.requirements)
+JOIN skills ON skills.name = trim(json_each.value)
+WHERE jobs.id > ?
+"""
+
+INSERT_JOB_SQL = """
+INSERT INTO jobs (
+    title, company, location, type, experience_level,
+    salary_range, description, requirements, benefits
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# One long-lived connection per (thread, database file), shared by all JobDatabase instances
+_local = threading.local()
+_initialized_paths = set()
+_init_lock = threading.Lock()
+
 
 class JobDatabase:
-    def __init__(self):
+    def __init__(self, db_path: Optional[str] = None):
         # Get the directory where database.py is located
         current_dir = Path(__file__).parent
-        self.db_path = current_dir / "jobs.sqlite"
+        self.db_path = Path(db_path or current_dir / "jobs.sqlite").resolve()
         self.schema_path = current_dir / "schema.sql"
         self._init_db()
 
-    def _init_db(self):
-        """Initialize the database with schema"""
-        if not self.schema_path.exists():
-            raise FileNotFoundError(f"Schema file not found at {self.schema_path}")
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's persistent connection to the database"""
+        connections = getattr(_local, "connections", None)
+        if connections is None:
+            connections = _local.connections = {}
+        conn = connections.get(self.db_path)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, cached_statements=STATEMENT_CACHE_SIZE)
+            conn.row_factory = sqlite3.Row
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            connections[self.db_path] = conn
+        return conn
 
-        with open(self.schema_path) as f:
-            schema = f.read()
+    def close(self):
+        """Close this thread's connection (it is reopened on next use)"""
+        conn = getattr(_local, "connections", {}).pop(self.db_path, None)
+        if conn is not None:
+            conn.close()
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript(schema)
+    def _init_db(self):
+        """Initialize the database with schema, once per process and only when outdated"""
+        if self.db_path in _initialized_paths:
+            return
+
+        with _init_lock:
+            if self.db_path in _initialized_paths:
+                return
+
+            conn = self.conn
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            existing = {
+                row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+            }
+            # A bulk load killed before its finally block leaves the deferred triggers dropped
+            interrupted_load = version >= SCHEMA_VERSION and not existing.issuperset(DEFERRED_TRIGGERS)
+            if version < SCHEMA_VERSION or interrupted_load:
+                if not self.schema_path.exists():
+                    raise FileNotFoundError(f"Schema file not found at {self.schema_path}")
+
+                with open(self.schema_path) as f:
+                    schema = f.read()
+
+                # Every statement is IF NOT EXISTS, so this only recreates what is missing
+                conn.executescript(schema)
+                with conn:
+                    # Index rows that were inserted before the derived tables (or triggers) existed
+                    if interrupted_load or "jobs_fts" not in existing:
+                        conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+                    if interrupted_load or "job_skills" not in existing:
+                        self._backfill_skills(conn, after_id=0)
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            _initialized_paths.add(self.db_path)
+
+    @staticmethod
+    def _backfill_skills(conn: sqlite3.Connection, after_id: int):
+        conn.execute(BACKFILL_SKILLS_SQL, (after_id,))
+        conn.execute(BACKFILL_JOB_SKILLS_SQL, (after_id,))
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "title": row["title"],
+            "company": row["company"],
+            "location": row["location"],
+            "type": row["type"],
+            "experience_level": row["experience_level"],
+            "salary_range": row["salary_range"],
+            "description": row["description"],
+            "requirements": json.loads(row["requirements"]),
+            "benefits": json.loads(row["benefits"]) if row["benefits"] else [],
+            "created_at": row["created_at"],
+        }
+
+    @staticmethod
+    def _fts_query(terms: List[str]) -> str:
+        """Build an FTS5 MATCH expression that ORs each term as a quoted phrase"""
+        phrases = []
+        for term in terms:
+            term = term.strip()
+            if term:
+                phrases.append('"' + term.replace('"', '""') + '"')
+        return " OR ".join(phrases)
+
+    @staticmethod
+    def _job_params(job_data: Dict[str, Any]) -> tuple:
+        return (
+            job_data["title"],
+            job_data["company"],
+            job_data["location"],
+            job_data["type"],
+            job_data["experience_level"],
+            job_data.get("salary_range"),
+            job_data["description"],
+            json.dumps(job_data["requirements"]),
+            json.dumps(job_data.get("benefits", [])),
+        )
 
     def add_job(self, job_data: Dict[str, Any]) -> int:
         """Add a new job to the database"""
-        query = """
-        INSERT INTO jobs (
-            title, company, location, type, experience_level,
-            salary_range, description, requirements, benefits
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        with self.conn as conn:
+            cursor = conn.execute(INSERT_JOB_SQL, self._job_params(job_data))
+            return cursor.lastrowid
+
+    def add_jobs_bulk(
+        self,
+        jobs: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE,
+        defer_index: bool = False,
+    ) -> int:
+        """Stream jobs into the database with executemany, one transaction per batch.
+
+        `jobs` may be any iterable (e.g. a generator); only one batch is held in
+        memory at a time. With `defer_index` the per-row FTS and skill triggers are
+        suspended and both indexes are rebuilt once at the end, which is several
+        times faster for full reloads. Returns the number of rows inserted.
         """
+        rows = (self._job_params(job) for job in jobs)
+        conn = self.conn
+        total = 0
+
+        trigger_sql = []
+        last_id = 0
+        if defer_index:
+            placeholders = ", ".join("?" for _ in DEFERRED_TRIGGERS)
+            trigger_sql = [
+                row[0] for row in conn.execute(
+                    f"SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})",
+                    DEFERRED_TRIGGERS,
+                )
+            ]
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM jobs").fetchone()[0]
+            with conn:
+                for name in DEFERRED_TRIGGERS:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {name}")
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                query,
-                (
-                    job_data["title"],
-                    job_data["company"],
-                    job_data["location"],
-                    job_data["type"],
-                    job_data["experience_level"],
-                    job_data.get("salary_range"),
-                    job_data["description"],
-                    json.dumps(job_data["requirements"]),
-                    json.dumps(job_data.get("benefits", [])),
-                ),
-            )
-            return cursor.lastrowid
+        try:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                with conn:
+                    conn.executemany(INSERT_JOB_SQL, batch)
+                total += len(batch)
+        finally:
+            if trigger_sql:
+                with conn:
+                    for sql in trigger_sql:
+                        conn.execute(sql)
+                    conn.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild')")
+                    self._backfill_skills(conn, after_id=last_id)
+        return total
 
     def get_all_jobs(self) -> List[Dict[str, Any]]:
         """Retrieve all jobs from the database"""
         query = "SELECT * FROM jobs ORDER BY created_at DESC"
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-
-            return [
-                {
-                    "id": row["id"],
-                    "title": row["title"],
-                    "company": row["company"],
-                    "location": row["location"],
-                    "type": row["type"],
-                    "experience_level": row["experience_level"],
-                    "salary_range": row["salary_range"],
-                    "description": row["description"],
-                    "requirements": json.loads(row["requirements"]),
-                    "benefits": json.loads(row["benefits"]) if row["benefits"] else [],
-                    "created_at": row["created_at"],
-                }
-                for row in rows
-            ]
+        rows = self.conn.execute(query).fetchall()
+        return [self._row_to_job(row) for row in rows]
 
     def search_jobs(
-        self, skills: List[str], experience_level: str
+        self,
+        skills: List[str],
+        experience_level: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
     ) -> List[Dict[str, Any]]:
-        """Search jobs based on skills and experience level"""
+        """Full-text search over title, description and requirements, ranked by BM25"""
+        match = self._fts_query(skills)
+        if not match:
+            return []
+
+        # bm25() is lower-is-better; weight title > requirements > description
         query = """
-        SELECT * FROM jobs
-        WHERE experience_level = ?
-        AND (
+        SELECT jobs.*, bm25(jobs_fts, 10.0, 1.0, 5.0) AS rank
+        FROM jobs_fts
+        JOIN jobs ON jobs.id = jobs_fts.rowid
+        WHERE jobs_fts MATCH ?
         """
-        query_conditions = []
-        params = [experience_level]
+        params: List[Any] = [match]
 
-        # Create LIKE conditions for each skill
-        for skill in skills:
-            query_conditions.append("requirements LIKE ?")
-            params.append(f"%{skill}%")
+        if experience_level:
+            query += " AND jobs.experience_level = ?"
+            params.append(experience_level)
 
-        query += " OR ".join(query_conditions) + ")"
+        query += " ORDER BY rank LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
 
         try:
-            with sqlite3.connect(self.db.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-
-                return [
-                    {
-                        "id": row["id"],
-                        "title": row["title"],
-                        "company": row["company"],
-                        "location": row["location"],
-                        "type": row["type"],
-                        "experience_level": row["experience_level"],
-                        "salary_range": row["salary_range"],
-                        "description": row["description"],
-                        "requirements": json.loads(row["requirements"]),
-                        "benefits": (
-                            json.loads(row["benefits"]) if row["benefits"] else []
-                        ),
-                    }
-                    for row in rows
-                ]
+            rows = self.conn.execute(query, params).fetchall()
+            return [
+                {**self._row_to_job(row), "relevance": round(-row["rank"], 4)}
+                for row in rows
+            ]
         except Exception as e:
             print(f"Error searching jobs: {e}")
             return []
 
+    def match_jobs_by_skills(
+        self,
+        skills: List[str],
+        require_all: bool = False,
+        experience_level: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Jobs requiring any (or all) of `skills`, ranked by skill overlap computed in SQL"""
+        # Case-insensitive dedupe so the "all" threshold counts distinct skills
+        wanted = list({skill.strip().lower(): skill.strip() for skill in skills if skill and skill.strip()}.values())
+        if not wanted:
+            return []
+
+        placeholders = ", ".join("?" for _ in wanted)
+        query = f"""
+        SELECT jobs.*, matches.overlap
+        FROM (
+            SELECT job_skills.job_id, COUNT(*) AS overlap
+            FROM skills
+            JOIN job_skills ON job_skills.skill_id = skills.id
+            WHERE skills.name IN ({placeholders})
+            GROUP BY job_skills.job_id
+            HAVING COUNT(*) >= ?
+        ) AS matches
+        JOIN jobs ON jobs.id = matches.job_id
+        """
+        params: List[Any] = [*wanted, len(wanted) if require_all else 1]
+
+        if experience_level:
+            query += " WHERE jobs.experience_level = ?"
+            params.append(experience_level)
+
+        query += " ORDER BY matches.overlap DESC, jobs.id DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        try:
+            rows = self.conn.execute(query, params).fetchall()
+            return [
+                {
+                    **self._row_to_job(row),
+                    "skill_overlap": row["overlap"],
+                    "match_score": round(row["overlap"] / len(wanted), 4),
+                }
+                for row in rows
+            ]
+        except Exception as e:
+            print(f"Error matching jobs by skills: {e}")
+            return []
 
 # import sqlite3
 # from pathlib import Path
@@ -0,0 +1,97 @@
+from pathlib import Path
+import argparse
+import random
+import re
+import sys
+import time
+from typing import Any, Dict, Iterator, Optional
+
+# Add parent directory to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from db.database import BULK_BATCH_SIZE, JobDatabase
+from db.seed_jobs import SEED_JOBS
+
+TITLE_PREFIXES = {
+    "Entry-level": ["", "Associate", "Trainee"],
+    "Junior": ["Junior", "Associate", ""],
+    "Mid-level": ["", "Senior", "Lead"],
+    "Senior": ["Senior", "Lead", "Principal", "Staff"],
+}
+
+COMPANY_SUFFIXES = ["Labs", "Systems", "Group", "Digital", "Solutions", "Works", "Analytics", "Global"]
+
+LOCATIONS = [
+    "Remote", "New York, NY", "San Francisco, CA", "Austin, TX", "Seattle, WA", "Boston, MA",
+    "Chicago, IL", "Denver, CO", "Bangalore", "Hyderabad", "Pune", "London", "Berlin", "Toronto",
+]
+
+EXTRA_SKILLS = [
+    "Python", "SQL", "Java", "Go", "TypeScript", "Docker", "Kubernetes", "AWS", "Azure", "GCP",
+    "Machine Learning", "Deep Learning", "Tableau", "Power BI", "Excel", "Figma", "Agile",
+    "Scrum", "Communication skills", "Leadership", "Data analysis", "Spark", "Airflow", "Terraform",
+]
+
+DESCRIPTION_SUFFIXES = [
+    "Collaborate closely with product and engineering teams.",
+    "Own deliverables end to end in a fast-paced environment.",
+    "Mentor teammates and contribute to best practices.",
+    "Work with stakeholders to translate requirements into results.",
+    "Help scale our platform to millions of users.",
+]
+
+_SALARY_NUMBER = re.compile(r"\d[\d,]*")
+
+
+def _scale_salary(salary_range: Optional[str], factor: float) -> Optional[str]:
+    if not salary_range:
+        return salary_range
+    return _SALARY_NUMBER.sub(
+        lambda m: f"{int(int(m.group().replace(',', '')) * factor):,}", salary_range
+    )
+
+
+def generate_jobs(count: int, seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Yield `count` realistic synthetic job postings derived from the seed templates"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        template = rng.choice(SEED_JOBS)
+        level = template["experience_level"]
+        prefix = rng.choice(TITLE_PREFIXES.get(level, [""]))
+        base_title = template["title"]
+        for word in ("Senior", "Junior"):
+            base_title = base_title.replace(f"{word} ", "")
+
+        requirements = list(template["requirements"])
+        requirements += rng.sample(EXTRA_SKILLS, rng.randint(0, 3))
+
+        yield {
+            "title": f"{prefix} {base_title}".strip(),
+            "company": f"{template['company']} {rng.choice(COMPANY_SUFFIXES)}",
+            "location": rng.choice(LOCATIONS),
+            "type": template["type"],
+            "experience_level": level,
+            "salary_range": _scale_salary(template.get("salary_range"), rng.uniform(0.8, 1.3)),
+            "description": f"{template['description']} {rng.choice(DESCRIPTION_SUFFIXES)}",
+            "requirements": list(dict.fromkeys(requirements)),
+            "benefits": rng.sample(template.get("benefits", []), len(template.get("benefits", []))),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load synthetic job postings for load testing")
+    parser.add_argument("--count", type=int, default=100000, help="number of jobs to generate")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE, help="rows per transaction")
+    parser.add_argument("--db", default=None, help="database path (defaults to db/jobs.sqlite)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible data")
+    args = parser.parse_args()
+
+    db = JobDatabase(args.db)
+    started = time.perf_counter()
+    inserted = db.add_jobs_bulk(generate_jobs(args.count, args.seed), batch_size=args.batch_size, defer_index=True)
+    elapsed = time.perf_counter() - started
+    print(f"Inserted {inserted:,} jobs in {elapsed:.1f}s ({inserted / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,4 +11,68 @@ CREATE TABLE IF NOT EXISTS jobs (
     benefits TEXT,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-);
\ No newline at end of file
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_experience_level ON jobs (experience_level);
+
+-- Full-text index over the searchable job fields, kept in sync with `jobs` by triggers
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title,
+    description,
+    requirements,
+    content='jobs',
+    content_rowid='id',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title, description, requirements)
+    VALUES (new.id, new.title, new.description, new.requirements);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, description, requirements)
+    VALUES ('delete', old.id, old.title, old.description, old.requirements);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, description, requirements)
+    VALUES ('delete', old.id, old.title, old.description, old.requirements);
+    INSERT INTO jobs_fts (rowid, title, description, requirements)
+    VALUES (new.id, new.title, new.description, new.requirements);
+END;
+
+-- Normalized skill dictionary; job_skills is kept in sync from jobs.requirements
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE
+);
+
+CREATE TABLE IF NOT EXISTS job_skills (
+    skill_id INTEGER NOT NULL REFERENCES skills (id),
+    job_id INTEGER NOT NULL REFERENCES jobs (id),
+    PRIMARY KEY (skill_id, job_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_job_skills_job ON job_skills (job_id, skill_id);
+
+CREATE TRIGGER IF NOT EXISTS jobs_skills_insert AFTER INSERT ON jobs BEGIN
+    INSERT OR IGNORE INTO skills (name)
+    SELECT trim(value) FROM json_each(new.requirements) WHERE trim(value) <> '';
+    INSERT OR IGNORE INTO job_skills (skill_id, job_id)
+    SELECT skills.id, new.id FROM json_each(new.requirements)
+    JOIN skills ON skills.name = trim(json_each.value);
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_skills_delete AFTER DELETE ON jobs BEGIN
+    DELETE FROM job_skills WHERE job_id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS jobs_skills_update AFTER UPDATE OF requirements ON jobs BEGIN
+    DELETE FROM job_skills WHERE job_id = old.id;
+    INSERT OR IGNORE INTO skills (name)
+    SELECT trim(value) FROM json_each(new.requirements) WHERE trim(value) <> '';
+    INSERT OR IGNORE INTO job_skills (skill_id, job_id)
+    SELECT skills.id, new.id FROM json_each(new.requirements)
+    JOIN skills ON skills.name = trim(json_each.value);
+END;
@@ -1,25 +1,18 @@
-import asyncio
-import requests
 from io import BytesIO
-from pdfminer.high_level import extract_text
 import streamlit as st
 from agents.analyzer_agent import AnalyzerAgent
 from agents.matcher_agent import MatcherAgent
+from utils.adzuna_client import search_jobs
+from utils.http_client import run_async
+from utils.pdf_extractor import extract_pdf_text
 import json
 
-# ================================
-# CONFIGURE ADZUNA API CREDENTIALS
-# ================================
-APP_ID = "ca7aba49"
-APP_KEY = "da0c323b9c0f3c974ec92c41a9db4f7b"
-COUNTRY = "in"
-
 # =========================
 # HELPER: Extract text from PDF
 # =========================
 def extract_text_from_pdf(file: BytesIO) -> str:
     try:
-        return extract_text(file).strip()
+        return extract_pdf_text(file).strip()
     except Exception as e:
         st.error(f"❌ Failed to extract text from PDF: {e}")
         return ""
@@ -28,21 +21,8 @@ def extract_text_from_pdf(file: BytesIO) -> str:
 # HELPER: Fetch jobs from Adzuna
 # =========================
 def fetch_jobs_from_adzuna(keywords, location="India", results_per_page=5):
-    search_term = " ".join(keywords)
-    url = f"https://api.adzuna.com/v1/api/jobs/{COUNTRY}/search/1"
-    params = {
-        "app_id": APP_ID,
-        "app_key": APP_KEY,
-        "what": search_term,
-        "where": location,
-        "results_per_page": results_per_page,
-        "content-type": "application/json",
-    }
-
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json().get("results", [])
+        return search_jobs(" ".join(keywords), where=location, results_per_page=results_per_page)
     except Exception as e:
         st.error(f"❌ Failed to fetch jobs from Adzuna: {e}")
         return []
@@ -68,10 +48,10 @@ if uploaded_file:
             with st.spinner("🧠 Analyzing resume..."):
                 analyzer = AnalyzerAgent()
                 messages = [{"role": "user", "content": json.dumps({"extracted_resume": {"structured_data": raw_text}})}]
-                st.session_state.analysis_result = asyncio.run(analyzer.run(messages))
+                st.session_state.analysis_result = run_async(analyzer.run(messages))
 
         st.subheader("📊 Resume Insights")
-        st.json(st.session_state.analysis_result)
+        st.json(st.session_state.analysis_result.to_dict())
 
         # === Extract once and reuse
         if "skills" not in st.session_state:
@@ -1,16 +1,79 @@
 # gemini_proxy.py
 
+import asyncio
+import json
+import math
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import httpx
 from fastapi import FastAPI, Request
-from pydantic import BaseModel
-import requests
-import os
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
-import streamlit as st
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from config import (
+    GEMINI_API_BASE,
+    GEMINI_CONNECT_TIMEOUT,
+    GEMINI_MODEL,
+    GOOGLE_API_KEY,
+    PROXY_BATCH_CONCURRENCY,
+    PROXY_BATCH_MAX_ITEMS,
+    PROXY_CACHE_MAX_ENTRIES,
+    PROXY_CACHE_TTL,
+    PROXY_CONCURRENCY_INITIAL,
+    PROXY_CONCURRENCY_MAX,
+    PROXY_CONCURRENCY_MIN,
+    PROXY_MAX_CONNECTIONS,
+    PROXY_MAX_KEEPALIVE,
+    PROXY_QUEUE_SIZE,
+    PROXY_RETRY_AFTER_MAX,
+    PROXY_UPSTREAM_RETRIES,
+    PROXY_UPSTREAM_TIMEOUT,
+)
+from utils.cache import LRUCache, make_cache_key
+from utils.exceptions import QueueFullError
+from utils.limiter import AdaptiveLimiter
+from utils.tracing import METRICS, payload_size, span
+
+# Upstream answers that mean "slow down": they shrink the concurrency limit
+OVERLOAD_STATUSES = (429, 503, 504)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled client for the life of the server: upstream TLS connections are reused
+    # and requests never block the event loop
+    app.state.client = httpx.AsyncClient(
+        base_url=GEMINI_API_BASE,
+        limits=httpx.Limits(
+            max_connections=PROXY_MAX_CONNECTIONS,
+            max_keepalive_connections=PROXY_MAX_KEEPALIVE,
+        ),
+        timeout=httpx.Timeout(PROXY_UPSTREAM_TIMEOUT, connect=GEMINI_CONNECT_TIMEOUT),
+        headers={"Content-Type": "application/json"},
+    )
+    # Successful generations keyed by (model, instructions, prompt), shared by every client
+    app.state.cache = LRUCache(max_entries=PROXY_CACHE_MAX_ENTRIES, ttl=PROXY_CACHE_TTL)
+    # Upstream calls currently running, so identical concurrent requests share one
+    app.state.inflight = {}
+    app.state.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+    # Upstream concurrency adapts to Gemini's capacity; excess requests wait in a bounded queue
+    app.state.limiter = AdaptiveLimiter(
+        initial=PROXY_CONCURRENCY_INITIAL,
+        min_limit=PROXY_CONCURRENCY_MIN,
+        max_limit=PROXY_CONCURRENCY_MAX,
+        max_queue=PROXY_QUEUE_SIZE,
+    )
+    try:
+        yield
+    finally:
+        await app.state.client.aclose()
 
-load_dotenv()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Allow all CORS origins (good for dev)
 app.add_middleware(
@@ -21,22 +84,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-GOOGLE_API_KEY = st.secrets["GOOGLE_API_KEY"]
-GEMINI_MODEL = "gemini-1.5-flash"  # or use "gemini-pro", "gemini-1.5-pro" etc.
 
 class PromptRequest(BaseModel):
     prompt: str
     instructions: str = ""
 
-@app.post("/gemini")
-async def query_gemini(request: PromptRequest):
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent?key={GOOGLE_API_KEY}"
 
-    headers = {"Content-Type": "application/json"}
+class BatchRequest(BaseModel):
+    items: List[PromptRequest]
+
 
+def build_gemini_payload(request: PromptRequest) -> dict:
     full_prompt = f"{request.instructions}\n\n{request.prompt}" if request.instructions else request.prompt
 
-    payload = {
+    return {
         "contents": [
             {
                 "parts": [
@@ -46,12 +107,260 @@ async def query_gemini(request: PromptRequest):
         ]
     }
 
+
+def _queue_full(e: QueueFullError) -> Tuple[int, Dict[str, Any]]:
+    return 429, {"error": 429, "message": str(e), "retry_after": e.retry_after}
+
+
+def parse_retry_after(value: Any) -> int:
+    """Whole seconds from a Retry-After header (delta-seconds, fractional or HTTP-date), at least 1"""
     try:
-        res = requests.post(url, headers=headers, json=payload)
+        seconds = float(value)
+    except (TypeError, ValueError):
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError, IndexError):
+            seconds = 1.0
+    if math.isnan(seconds):
+        seconds = 1.0
+    return max(1, math.ceil(min(seconds, 3600.0)))
+
+
+async def _post_upstream(client: httpx.AsyncClient, request: PromptRequest) -> Tuple[int, Dict[str, Any]]:
+    try:
+        res = await client.post(
+            f"/models/{GEMINI_MODEL}:generateContent",
+            params={"key": GOOGLE_API_KEY},
+            json=build_gemini_payload(request),
+        )
         if res.status_code == 200:
             output = res.json()["candidates"][0]["content"]["parts"][0]["text"]
-            return {"result": output}
+            return 200, {"result": output}
+        try:
+            details = res.json()
+        except ValueError:
+            details = res.text
+        body = {"error": res.status_code, "details": details}
+        if res.status_code in (429, 503):
+            body["retry_after"] = parse_retry_after(res.headers.get("Retry-After"))
+        return res.status_code, body
+    except httpx.TimeoutException as e:
+        return 504, {"error": "Timeout", "message": str(e)}
+    except Exception as e:
+        return 502, {"error": "Exception", "message": str(e)}
+
+
+async def call_gemini(state, request: PromptRequest) -> Tuple[int, Dict[str, Any]]:
+    """Run one upstream generation under the adaptive limiter and return (status code, response body)"""
+    try:
+        for attempt in range(PROXY_UPSTREAM_RETRIES + 1):
+            async with state.limiter.acquire() as permit:
+                with span("proxy.upstream", attempt=attempt, request_bytes=payload_size(request.prompt)) as current:
+                    status, body = await _post_upstream(state.client, request)
+                    current.set(
+                        status=status,
+                        queue_s=round(permit.queue_time, 4),
+                        response_bytes=payload_size(body.get("result")),
+                    )
+                    if status != 200:
+                        current.fail(body.get("details", body.get("message", status)))
+                if status not in OVERLOAD_STATUSES:
+                    return status, body
+                permit.overloaded()
+            # Rejoin the queue behind the now-smaller limit instead of bouncing the client
+            if status == 504 or attempt == PROXY_UPSTREAM_RETRIES:
+                break
+            # ...but only after the upstream's Retry-After (capped: the client is waiting), outside the permit
+            await asyncio.sleep(min(body.get("retry_after", 1), PROXY_RETRY_AFTER_MAX))
+        return status, body
+    except QueueFullError as e:
+        return _queue_full(e)
+
+
+def _retry_headers(status: int, body: Dict[str, Any]) -> Dict[str, str]:
+    return {"Retry-After": str(body["retry_after"])} if status == 429 and "retry_after" in body else {}
+
+
+async def _fetch_and_cache(state, key: str, request: PromptRequest) -> Tuple[int, Dict[str, Any]]:
+    status, body = await call_gemini(state, request)
+    if status == 200:
+        state.cache.set(key, (time.time(), body))
+    return status, body
+
+
+async def generate(state, request: PromptRequest) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+    """Serve one prompt from the cache, an identical in-flight call, or upstream.
+
+    Returns (status code, response body, cache headers).
+    """
+    with span("proxy.generate", request_bytes=payload_size(request.prompt)) as current:
+        key = make_cache_key(GEMINI_MODEL, request.instructions, request.prompt)
+
+        cached = state.cache.get(key)
+        if cached is not None:
+            stored_at, body = cached
+            state.stats["hits"] += 1
+            current.set(cache_hit=True, status=200)
+            return 200, body, {"X-Cache": "HIT", "Age": str(int(time.time() - stored_at))}
+
+        task = state.inflight.get(key)
+        if task is None:
+            state.stats["misses"] += 1
+            x_cache = "MISS"
+            task = asyncio.create_task(_fetch_and_cache(state, key, request))
+            state.inflight[key] = task
+            task.add_done_callback(lambda _: state.inflight.pop(key, None))
         else:
-            return {"error": res.status_code, "details": res.json()}
+            state.stats["coalesced"] += 1
+            x_cache = "COALESCED"
+
+        # Shielded so a client disconnecting does not cancel the call other waiters share
+        status, body = await asyncio.shield(task)
+        current.set(cache_hit=x_cache == "COALESCED", x_cache=x_cache, status=status)
+        if status != 200:
+            current.fail(status)
+        return status, body, {"X-Cache": x_cache, **_retry_headers(status, body)}
+
+
+@app.post("/gemini")
+async def query_gemini(request: PromptRequest, http_request: Request):
+    status, body, headers = await generate(http_request.app.state, request)
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+@app.post("/gemini/batch")
+async def query_gemini_batch(batch: BatchRequest, http_request: Request):
+    """Run many prompts in one round trip; results come back in request order with per-item errors"""
+    if len(batch.items) > PROXY_BATCH_MAX_ITEMS:
+        return JSONResponse(
+            {"error": "Batch too large", "message": f"At most {PROXY_BATCH_MAX_ITEMS} items per batch"},
+            status_code=413,
+        )
+
+    state = http_request.app.state
+    semaphore = asyncio.Semaphore(PROXY_BATCH_CONCURRENCY)
+
+    async def run_item(item: PromptRequest) -> Dict[str, Any]:
+        async with semaphore:
+            status, body, headers = await generate(state, item)
+        return {**body, "status": status, "cache": headers["X-Cache"]}
+
+    results = await asyncio.gather(*(run_item(item) for item in batch.items))
+    return {"results": results}
+
+
+def _sse(data: Dict[str, Any], event: str = "") -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+async def stream_gemini(state, key: str, request: PromptRequest) -> AsyncIterator[str]:
+    """Relay Gemini's streamed generation as server-sent events, caching the full text once complete"""
+    chunks = []
+    try:
+        async with state.limiter.acquire() as permit:
+            try:
+                async with state.client.stream(
+                    "POST",
+                    f"/models/{GEMINI_MODEL}:streamGenerateContent",
+                    params={"key": GOOGLE_API_KEY, "alt": "sse"},
+                    json=build_gemini_payload(request),
+                ) as res:
+                    if res.status_code != 200:
+                        if res.status_code in OVERLOAD_STATUSES:
+                            permit.overloaded()
+                        details = (await res.aread()).decode("utf-8", "replace")
+                        yield _sse({"error": res.status_code, "details": details}, event="error")
+                        return
+                    async for line in res.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        event = json.loads(line[5:])
+                        parts = event.get("candidates", [{}])[0].get("content", {}).get("parts", [])
+                        text = "".join(part.get("text", "") for part in parts)
+                        if text:
+                            chunks.append(text)
+                            yield _sse({"text": text})
+            except httpx.TimeoutException:
+                permit.overloaded()
+                raise
+    except QueueFullError as e:
+        yield _sse(_queue_full(e)[1], event="error")
+        return
+    except httpx.TimeoutException as e:
+        yield _sse({"error": "Timeout", "message": str(e)}, event="error")
+        return
     except Exception as e:
-        return {"error": "Exception", "message": str(e)}
+        yield _sse({"error": "Exception", "message": str(e)}, event="error")
+        return
+
+    state.cache.set(key, (time.time(), {"result": "".join(chunks)}))
+    yield _sse({}, event="done")
+
+
+@app.post("/gemini/stream")
+async def query_gemini_stream(request: PromptRequest, http_request: Request):
+    """Server-sent events: `data: {"text": ...}` per chunk, then `event: done` (or `event: error`)"""
+    state = http_request.app.state
+    key = make_cache_key(GEMINI_MODEL, request.instructions, request.prompt)
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+    if state.limiter.full:
+        status, body = _queue_full(QueueFullError(state.limiter.retry_after()))
+        return JSONResponse(body, status_code=status, headers=_retry_headers(status, body))
+
+    cached = state.cache.get(key)
+    if cached is not None:
+        state.stats["hits"] += 1
+
+        async def replay() -> AsyncIterator[str]:
+            yield _sse({"text": cached[1]["result"]})
+            yield _sse({}, event="done")
+
+        return StreamingResponse(replay(), media_type="text/event-stream", headers={**headers, "X-Cache": "HIT"})
+
+    state.stats["misses"] += 1
+    return StreamingResponse(
+        stream_gemini(state, key, request),
+        media_type="text/event-stream",
+        headers={**headers, "X-Cache": "MISS"},
+    )
+
+
+@app.get("/gemini/stats")
+async def gemini_stats(http_request: Request):
+    state = http_request.app.state
+    stats = dict(state.stats)
+    lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+    stats["hit_rate"] = round((stats["hits"] + stats["coalesced"]) / lookups, 4) if lookups else 0.0
+    stats["cache_entries"] = len(state.cache)
+    stats["inflight"] = len(state.inflight)
+    stats["limiter"] = state.limiter.stats()
+    return stats
+
+
+@app.get("/metrics")
+async def metrics(http_request: Request):
+    """Prometheus exposition: span latency histograms plus cache and limiter state"""
+    state = http_request.app.state
+    limiter = state.limiter.stats()
+    lines = [
+        "# TYPE gemini_proxy_cache_requests_total counter",
+        *(
+            f'gemini_proxy_cache_requests_total{{result="{result}"}} {state.stats[result]}'
+            for result in ("hits", "misses", "coalesced")
+        ),
+        "# TYPE gemini_proxy_cache_entries gauge",
+        f"gemini_proxy_cache_entries {len(state.cache)}",
+        "# TYPE gemini_proxy_concurrency_limit gauge",
+        f"gemini_proxy_concurrency_limit {limiter['limit']}",
+        "# TYPE gemini_proxy_upstream_in_flight gauge",
+        f"gemini_proxy_upstream_in_flight {limiter['in_flight']}",
+        "# TYPE gemini_proxy_queue_depth gauge",
+        f"gemini_proxy_queue_depth {limiter['queued']}",
+        "# TYPE gemini_proxy_queue_rejected_total counter",
+        f"gemini_proxy_queue_rejected_total {limiter['rejected']}",
+        "# TYPE gemini_proxy_upstream_overloaded_total counter",
+        f"gemini_proxy_upstream_overloaded_total {limiter['dropped']}",
+    ]
+    return PlainTextResponse(METRICS.render_prometheus(prefix="gemini_proxy") + "\n".join(lines) + "\n")
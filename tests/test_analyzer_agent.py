@@ -0,0 +1,18 @@
+from agents.analyzer_agent import ANALYSIS_DEFAULTS, build_analysis_result, validate_analysis
+
+
+def test_dict_without_schema_keys_is_a_fallback():
+    for parsed in ({}, {"analysis": {"technical_skills": ["Python"]}}):
+        analysis, used_fallback = validate_analysis(parsed)
+        assert used_fallback
+        assert analysis == ANALYSIS_DEFAULTS
+        assert build_analysis_result(parsed).confidence_score <= 0.5
+
+
+def test_partial_answer_keeps_valid_keys():
+    analysis, used_fallback = validate_analysis({"technical_skills": ["Go"], "years_of_experience": "5+"})
+    assert not used_fallback
+    assert analysis["technical_skills"] == ["Go"]
+    assert analysis["years_of_experience"] == 5.0
+    assert analysis["education"] == ANALYSIS_DEFAULTS["education"]
+    assert build_analysis_result({"technical_skills": ["Go"]}).confidence_score == 0.85
@@ -0,0 +1,19 @@
+from utils.skill_matcher import SkillMatcher, tokenize
+
+
+def test_c_does_not_match_inside_cpp_or_csharp():
+    matcher = SkillMatcher(["c", "c++", "c#", "java", "javascript"])
+    assert matcher.find_all("Senior JavaScript dev with Java and C++") == {"javascript", "java", "c++"}
+    assert matcher.find_all("Backend in C#") == {"c#"}
+    assert matcher.find_all("Embedded C, some C++.") == {"c", "c++"}
+
+
+def test_node_does_not_match_inside_node_js():
+    matcher = SkillMatcher(["node", "node.js"])
+    assert matcher.find_all("APIs written in node.js") == {"node.js"}
+    assert matcher.find_all("Cluster node setup.") == {"node"}
+
+
+def test_trailing_sentence_dots_are_dropped():
+    assert tokenize("Python. C++, node.js.") == ["python", "c++", ",", "node.js"]
+    assert SkillMatcher(["ci/cd", ".net"]).find_all("CI/CD pipelines for .NET services") == {"ci/cd", ".net"}
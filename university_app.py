@@ -1,9 +1,7 @@
 import streamlit as st
-import asyncio
-from datetime import datetime
-from pathlib import Path
-import os
 from agents.university_agent import UniversityAgent
+from utils.http_client import run_async
+from utils.pdf_extractor import extract_pdf_text
 from utils.logger import setup_logger
 
 # Setup
@@ -44,22 +42,6 @@ def format_result_as_markdown(result: dict, level: int = 3) -> str:
     return markdown
 
 
-def save_temp_file(uploaded_file) -> str:
-    """Save uploaded file to a temporary path and return filepath"""
-    try:
-        temp_dir = Path("uploads")
-        temp_dir.mkdir(exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        temp_path = temp_dir / f"university_{timestamp}_{uploaded_file.name}"
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.read())
-        return str(temp_path)
-    except Exception as e:
-        st.error(f"Error saving uploaded file: {e}")
-        logger.error("Upload save error", exc_info=True)
-        return ""
-
-
 async def process_university_text(text: str) -> dict:
     """Send university content to AI agent and return structured response"""
     try:
@@ -84,7 +66,7 @@ def render_university_interface():
         university_text = st.text_area("Paste Curriculum Content", height=300)
         if university_text and st.button("Analyze Curriculum"):
             with st.spinner("Analyzing curriculum..."):
-                result = asyncio.run(process_university_text(university_text))
+                result = run_async(process_university_text(university_text))
                 st.subheader("📘 AI Analysis Result")
                 try:
                     st.markdown(format_result_as_markdown(result))
@@ -103,16 +85,13 @@ def render_university_interface():
                 if ext == "txt":
                     university_text = uploaded_file.read().decode("utf-8")
                 elif ext == "pdf":
-                    from pdfminer.high_level import extract_text
-                    temp_path = save_temp_file(uploaded_file)
-                    university_text = extract_text(temp_path)
-                    os.remove(temp_path)
+                    university_text = extract_pdf_text(uploaded_file.getvalue())
                 else:
                     st.error("Unsupported file format.")
                     return
 
                 with st.spinner("Analyzing uploaded curriculum..."):
-                    result = asyncio.run(process_university_text(university_text))
+                    result = run_async(process_university_text(university_text))
                     st.subheader("📘 AI Analysis Result")
                     st.json(result)
                     st.session_state.university_result = result
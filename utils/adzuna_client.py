@@ -0,0 +1,185 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    ADZUNA_APP_ID,
+    ADZUNA_APP_KEY,
+    ADZUNA_CACHE_TTL,
+    ADZUNA_COUNTRY,
+    ADZUNA_TIMEOUT,
+    CACHE_DB_PATH,
+)
+from utils.cache import TieredCache, make_cache_key
+from utils.exceptions import MatchingError
+from utils.http_client import get_async_client, get_client
+from utils.tracing import annotate, span
+
+ADZUNA_SEARCH_URL = "https://api.adzuna.com/v1/api/jobs/{country}/search/{page}"
+
+_cache = None
+_cache_lock = threading.Lock()
+
+# Single-flight registry: identical queries in flight share one upstream call.
+# concurrent.futures.Future lets blocking callers and callers on any event loop
+# (each Streamlit session runs its own asyncio.run) wait on the same result.
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+class _LeaderCancelled(Exception):
+    """Put on the shared future when the leading caller is cancelled; followers then retry the fetch"""
+
+
+def get_adzuna_cache() -> TieredCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TieredCache("adzuna", CACHE_DB_PATH, ttl=ADZUNA_CACHE_TTL)
+    return _cache
+
+
+def _prepare(
+    what: str,
+    where: Optional[str],
+    page: int,
+    results_per_page: int,
+    country: Optional[str],
+) -> Tuple[str, str, Dict[str, Any]]:
+    if not ADZUNA_APP_ID or not ADZUNA_APP_KEY:
+        raise MatchingError(
+            "Adzuna credentials are not configured: set ADZUNA_APP_ID and ADZUNA_APP_KEY "
+            "in Streamlit secrets or the environment"
+        )
+    country = country or ADZUNA_COUNTRY
+    key = make_cache_key("adzuna", country, what, where, page, results_per_page)
+    url = ADZUNA_SEARCH_URL.format(country=country, page=page)
+    params = {
+        "app_id": ADZUNA_APP_ID,
+        "app_key": ADZUNA_APP_KEY,
+        "what": what,
+        "results_per_page": results_per_page,
+        "content-type": "application/json",
+    }
+    if where:
+        params["where"] = where
+    return key, url, params
+
+
+def _claim(key: str) -> Tuple[Future, bool]:
+    """Return the in-flight future for `key` and whether the caller must perform the fetch"""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        if future is not None:
+            return future, False
+        future = Future()
+        # Running futures cannot be cancelled, so a cancelled follower never cancels it for the others
+        future.set_running_or_notify_cancel()
+        _inflight[key] = future
+        return future, True
+
+
+def _release(key: str) -> None:
+    with _inflight_lock:
+        _inflight.pop(key, None)
+
+
+def search_jobs(
+    what: str,
+    where: Optional[str] = None,
+    page: int = 1,
+    results_per_page: int = 10,
+    country: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Search Adzuna, served from the shared cache when possible. Raises on HTTP errors."""
+    with span("adzuna.search", what=what, page=page, mode="sync"):
+        key, url, params = _prepare(what, where, page, results_per_page, country)
+        cache = get_adzuna_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            annotate(cache_hit=True, results=len(cached))
+            return cached
+
+        while True:
+            future, leader = _claim(key)
+            if leader:
+                break
+            annotate(coalesced=True)
+            try:
+                return future.result()
+            except _LeaderCancelled:
+                continue
+
+        try:
+            response = get_client().get(url, params=params, timeout=ADZUNA_TIMEOUT)
+            response.raise_for_status()
+            results = response.json().get("results", [])
+            annotate(cache_hit=False, results=len(results), response_bytes=len(response.content))
+            cache.set(key, results)
+        except Exception as e:
+            _release(key)
+            future.set_exception(e)
+            raise
+        except BaseException:
+            # Cancellation is the leader's own business: never hand CancelledError to other
+            # sessions. The key is released first, so a retrying follower becomes the new leader.
+            _release(key)
+            future.set_exception(_LeaderCancelled())
+            raise
+        _release(key)
+        future.set_result(results)
+        return results
+
+
+async def search_jobs_async(
+    what: str,
+    where: Optional[str] = None,
+    page: int = 1,
+    results_per_page: int = 10,
+    country: Optional[str] = None,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> List[Dict[str, Any]]:
+    """Awaitable variant of search_jobs; `semaphore` caps concurrent upstream calls"""
+    with span("adzuna.search", what=what, page=page, mode="async"):
+        key, url, params = _prepare(what, where, page, results_per_page, country)
+        cache = get_adzuna_cache()
+        cached = cache.get(key)
+        if cached is not None:
+            annotate(cache_hit=True, results=len(cached))
+            return cached
+
+        while True:
+            future, leader = _claim(key)
+            if leader:
+                break
+            annotate(coalesced=True)
+            try:
+                return await asyncio.wrap_future(future)
+            except _LeaderCancelled:
+                continue
+
+        try:
+            if semaphore is not None:
+                async with semaphore:
+                    response = await get_async_client().get(url, params=params, timeout=ADZUNA_TIMEOUT)
+            else:
+                response = await get_async_client().get(url, params=params, timeout=ADZUNA_TIMEOUT)
+            response.raise_for_status()
+            results = response.json().get("results", [])
+            annotate(cache_hit=False, results=len(results), response_bytes=len(response.content))
+            cache.set(key, results)
+        except Exception as e:
+            _release(key)
+            future.set_exception(e)
+            raise
+        except BaseException:
+            # Cancellation is the leader's own business: never hand CancelledError to other
+            # sessions. The key is released first, so a retrying follower becomes the new leader.
+            _release(key)
+            future.set_exception(_LeaderCancelled())
+            raise
+        _release(key)
+        future.set_result(results)
+        return results
@@ -0,0 +1,59 @@
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+from config import CACHE_DB_PATH, CHECKPOINT_TTL, CHECKPOINTS_ENABLED
+from utils.cache import TieredCache, make_cache_key
+from utils.serialization import dumps
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def input_fingerprint(inputs: Dict[str, Any]) -> str:
+    """SHA-256 of a stage's inputs as serialized JSON (stage-output dataclasses included)"""
+    return hashlib.sha256(dumps(inputs)).hexdigest()
+
+
+def _plain(output: Any) -> Any:
+    return output.to_dict() if hasattr(output, "to_dict") else output
+
+
+class CheckpointStore:
+    """Completed stage outputs keyed by (resume hash, stage, stage version, stage-input hash).
+
+    A rerun of the same resume finds every stage whose inputs are unchanged and
+    skips it, so only the stage that failed (and whatever depends on it) runs again.
+    """
+
+    def __init__(self, cache: TieredCache):
+        self.cache = cache
+
+    @staticmethod
+    def key(run_id: str, stage: str, version: str, inputs: Dict[str, Any]) -> str:
+        return make_cache_key("checkpoint", run_id, stage, version, input_fingerprint(inputs))
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.cache.get(key)
+
+    def save(self, key: str, output: Any) -> None:
+        """Store a stage output (a tuple of them for a fused stage) as plain JSON data"""
+        if isinstance(output, tuple):
+            self.cache.set(key, [_plain(item) for item in output])
+        else:
+            self.cache.set(key, _plain(output))
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """Return the process-wide stage checkpoint store, or None when disabled"""
+    global _store
+    if not CHECKPOINTS_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CheckpointStore(TieredCache("checkpoints", CACHE_DB_PATH, ttl=CHECKPOINT_TTL))
+    return _store
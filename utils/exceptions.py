@@ -32,3 +32,20 @@ class RecommendationError(ResumeProcessingError):
     """Raised when generating recommendations fails"""
 
     pass
+
+
+class PipelineStageError(ResumeProcessingError):
+    """Raised when a stage of the orchestration pipeline fails"""
+
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(f"{stage}: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class QueueFullError(Exception):
+    """Raised when a concurrency limiter's wait queue is full"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Queue full, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
@@ -1,18 +1,186 @@
-import requests
+import asyncio
+import json
+import time
+from typing import AsyncIterator, List, Optional
 
-def query_gemini_proxy(prompt: str, instructions: str = "") -> str:
-    url = "https://proxy-server-m0x4.onrender.com/gemini"  # ✅ Correct endpoint
-    headers = {"Content-Type": "application/json"}
-    payload = {
+from config import (
+    GEMINI_BATCH_SIZE,
+    GEMINI_BATCH_TIMEOUT,
+    GEMINI_MAX_RETRIES,
+    GEMINI_PROXY_BATCH_URL,
+    GEMINI_PROXY_STREAM_URL,
+    GEMINI_PROXY_URL,
+    GEMINI_RETRY_MAX_WAIT,
+)
+from utils.http_client import get_async_client, get_client
+
+_ERROR_PREFIXES = ("❌", "Proxy Error", "No result found.")
+
+
+def is_error_response(text: str) -> bool:
+    """True for the placeholder strings returned instead of a generation"""
+    return not text or text.startswith(_ERROR_PREFIXES)
+
+
+def _build_payload(prompt: str, instructions: str) -> dict:
+    return {
         "prompt": prompt,
         "instructions": instructions
     }
 
+
+def _parse_response(res) -> str:
+    if res.status_code == 200:
+        return res.json().get("result", "No result found.")
     try:
-        res = requests.post(url, headers=headers, json=payload)
-        if res.status_code == 200:
-            return res.json().get("result", "No result found.")
-        else:
-            return f"❌ Error {res.status_code}: {res.json()}"
+        details = res.json()
+    except ValueError:
+        details = res.text
+    return f"❌ Error {res.status_code}: {details}"
+
+
+def _retry_delay(res, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying a 429 (honouring Retry-After), or None to give up"""
+    if res.status_code != 429 or attempt >= GEMINI_MAX_RETRIES:
+        return None
+    try:
+        wait = float(res.headers.get("Retry-After", 1))
+    except ValueError:
+        wait = 1.0
+    return min(wait, GEMINI_RETRY_MAX_WAIT)
+
+
+def _post_with_retry(url: str, payload: dict, **kwargs):
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        res = get_client().post(url, json=payload, **kwargs)
+        delay = _retry_delay(res, attempt)
+        if delay is None:
+            return res
+        time.sleep(delay)
+
+
+async def _post_with_retry_async(url: str, payload: dict, **kwargs):
+    client = get_async_client()
+    for attempt in range(GEMINI_MAX_RETRIES + 1):
+        res = await client.post(url, json=payload, **kwargs)
+        delay = _retry_delay(res, attempt)
+        if delay is None:
+            return res
+        await asyncio.sleep(delay)
+
+
+def _parse_batch_item(item: dict) -> str:
+    if item.get("status") == 200:
+        return item.get("result", "No result found.")
+    details = item.get("details", item.get("message"))
+    return f"❌ Error {item.get('status')}: {details}"
+
+
+def _parse_batch_response(res, count: int) -> List[str]:
+    if res.status_code != 200:
+        return [_parse_response(res)] * count
+    return [_parse_batch_item(item) for item in res.json()["results"]]
+
+
+def _batch_chunks(prompts: List[str], instructions: str) -> List[List[dict]]:
+    items = [_build_payload(prompt, instructions) for prompt in prompts]
+    return [items[start:start + GEMINI_BATCH_SIZE] for start in range(0, len(items), GEMINI_BATCH_SIZE)]
+
+
+def query_gemini_proxy(prompt: str, instructions: str = "", timeout: Optional[float] = None) -> str:
+    """Blocking call to the Gemini proxy over the shared connection pool"""
+    kwargs = {"timeout": timeout} if timeout is not None else {}
+    try:
+        res = _post_with_retry(GEMINI_PROXY_URL, _build_payload(prompt, instructions), **kwargs)
+        return _parse_response(res)
+    except Exception as e:
+        return f"❌ Exception occurred: {str(e)}"
+
+
+async def query_gemini_proxy_async(prompt: str, instructions: str = "", timeout: Optional[float] = None) -> str:
+    """Awaitable call to the Gemini proxy; concurrent calls share one connection pool"""
+    kwargs = {"timeout": timeout} if timeout is not None else {}
+    try:
+        res = await _post_with_retry_async(GEMINI_PROXY_URL, _build_payload(prompt, instructions), **kwargs)
+        return _parse_response(res)
     except Exception as e:
         return f"❌ Exception occurred: {str(e)}"
+
+
+def query_gemini_proxy_many(prompts: List[str], instructions: str = "", timeout: Optional[float] = None) -> List[str]:
+    """Blocking batch call: one round trip per GEMINI_BATCH_SIZE prompts, results in prompt order"""
+    results = []
+    for chunk in _batch_chunks(prompts, instructions):
+        try:
+            res = _post_with_retry(
+                GEMINI_PROXY_BATCH_URL, {"items": chunk}, timeout=timeout or GEMINI_BATCH_TIMEOUT
+            )
+            results.extend(_parse_batch_response(res, len(chunk)))
+        except Exception as e:
+            results.extend([f"❌ Exception occurred: {str(e)}"] * len(chunk))
+    return results
+
+
+async def query_gemini_proxy_many_async(
+    prompts: List[str], instructions: str = "", timeout: Optional[float] = None
+) -> List[str]:
+    """Awaitable batch call; chunks are sent concurrently and results come back in prompt order"""
+    async def send(chunk: List[dict]) -> List[str]:
+        try:
+            res = await _post_with_retry_async(
+                GEMINI_PROXY_BATCH_URL, {"items": chunk}, timeout=timeout or GEMINI_BATCH_TIMEOUT
+            )
+            return _parse_batch_response(res, len(chunk))
+        except Exception as e:
+            return [f"❌ Exception occurred: {str(e)}"] * len(chunk)
+
+    chunks = await asyncio.gather(*(send(chunk) for chunk in _batch_chunks(prompts, instructions)))
+    return [result for chunk in chunks for result in chunk]
+
+
+async def _iter_sse_text(res) -> AsyncIterator[str]:
+    """Text chunks of a proxy SSE response; a streamed error becomes one error string"""
+    event = ""
+    async for line in res.aiter_lines():
+        if line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data = json.loads(line[5:])
+            if event == "error":
+                yield f"❌ Error {data.get('error')}: {data.get('details', data.get('message'))}"
+                return
+            if event == "done":
+                return
+            if data.get("text"):
+                yield data["text"]
+        elif not line:
+            event = ""
+
+
+async def stream_gemini_proxy(
+    prompt: str, instructions: str = "", timeout: Optional[float] = None
+) -> AsyncIterator[str]:
+    """Yield generated text chunks as the proxy streams them.
+
+    Failures are yielded as a single error string (same format as the other
+    calls) and end the stream.
+    """
+    kwargs = {"timeout": timeout} if timeout is not None else {}
+    try:
+        client = get_async_client()
+        for attempt in range(GEMINI_MAX_RETRIES + 1):
+            async with client.stream(
+                "POST", GEMINI_PROXY_STREAM_URL, json=_build_payload(prompt, instructions), **kwargs
+            ) as res:
+                if res.status_code == 200:
+                    async for chunk in _iter_sse_text(res):
+                        yield chunk
+                    return
+                await res.aread()
+            delay = _retry_delay(res, attempt)
+            if delay is None:
+                yield _parse_response(res)
+                return
+            await asyncio.sleep(delay)
+    except Exception as e:
+        yield f"❌ Exception occurred: {str(e)}"
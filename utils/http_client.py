@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import weakref
+from typing import Awaitable, TypeVar
+
+import httpx
+
+from config import (
+    GEMINI_CONNECT_TIMEOUT,
+    GEMINI_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+)
+
+_LIMITS = httpx.Limits(
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+)
+_DEFAULT_TIMEOUT = httpx.Timeout(GEMINI_TIMEOUT, connect=GEMINI_CONNECT_TIMEOUT)
+
+T = TypeVar("T")
+
+_sync_client = None
+_sync_lock = threading.Lock()
+
+# httpx async connections are bound to the event loop that opened them, and
+# Streamlit starts a fresh loop for every asyncio.run(), so keep one pool per loop.
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_client() -> httpx.Client:
+    """Return the process-wide pooled blocking client"""
+    global _sync_client
+    if _sync_client is None or _sync_client.is_closed:
+        with _sync_lock:
+            if _sync_client is None or _sync_client.is_closed:
+                _sync_client = httpx.Client(limits=_LIMITS, timeout=_DEFAULT_TIMEOUT)
+    return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the pooled async client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(limits=_LIMITS, timeout=_DEFAULT_TIMEOUT)
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the pooled async client of the running loop (call before the loop ends)"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """asyncio.run() for Streamlit handlers and scripts.
+
+    The loop's pooled client holds connections bound to that loop, so it is
+    closed before the loop ends; otherwise every run leaks a client and sockets.
+    """
+    async def runner() -> T:
+        try:
+            return await coro
+        finally:
+            await close_async_client()
+
+    return asyncio.run(runner())
@@ -0,0 +1,167 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from utils.exceptions import QueueFullError
+
+
+class Permit:
+    """Handed out by AdaptiveLimiter.acquire(); mark it overloaded when upstream pushes back"""
+
+    __slots__ = ("queue_time", "dropped")
+
+    def __init__(self, queue_time: float):
+        self.queue_time = queue_time
+        self.dropped = False
+
+    def overloaded(self) -> None:
+        self.dropped = True
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit with a bounded FIFO wait queue.
+
+    Every successful call raises the limit by about one per round of `limit`
+    calls; a call marked overloaded (upstream 429/503/timeout) halves it, at
+    most once per round trip (the typical successful call duration, capped by
+    `cooldown` seconds) so one burst of failures counts once.
+    When `max_queue` callers are already waiting, acquire() raises
+    QueueFullError with a Retry-After estimate instead of queueing more.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        max_queue: int = 100,
+        backoff: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        self._last_decrease = 0.0
+        self._latency = 1.0  # EWMA of successful call duration, seconds
+        self.completed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def full(self) -> bool:
+        return len(self._waiters) >= self.max_queue
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue should have drained at the current limit"""
+        rounds = (len(self._waiters) + 1) / max(self.limit, 1.0)
+        return max(1, math.ceil(rounds * self._latency))
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < max(int(self.limit), self.min_limit)
+
+    async def _wait_turn(self) -> float:
+        started = time.perf_counter()
+        if self._has_capacity() and not self._waiters:
+            self.in_flight += 1
+            return 0.0
+        if self.full:
+            self.rejected += 1
+            raise QueueFullError(self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif waiter.done() and not waiter.cancelled():
+                # Slot was handed to us just as we were cancelled: pass it on
+                self.in_flight -= 1
+                self._wake()
+            raise
+        return time.perf_counter() - started
+
+    def _wake(self) -> None:
+        while self._waiters and self._has_capacity():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _release(self, permit: Permit, duration: float) -> None:
+        self.in_flight -= 1
+        now = time.monotonic()
+        if permit.dropped:
+            self.dropped += 1
+            if now - self._last_decrease >= min(self._latency, self.cooldown):
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = now
+        else:
+            self.completed += 1
+            self._latency = 0.8 * self._latency + 0.2 * duration
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        self._wake()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Permit]:
+        queue_time = await self._wait_turn()
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        permit = Permit(queue_time)
+        started = time.perf_counter()
+        try:
+            yield permit
+        finally:
+            self._release(permit, time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        admitted = self.completed + self.dropped
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "avg_queue_ms": round(1000 * self.queue_time_total / admitted, 2) if admitted else 0.0,
+            "max_queue_ms": round(1000 * self.queue_time_max, 2),
+        }
+
+
+class RateLimiter:
+    """Spaces acquisitions to at most `rate` per second (0 disables), allowing bursts of `burst`"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
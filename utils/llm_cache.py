@@ -0,0 +1,37 @@
+import threading
+from typing import Optional
+
+from config import (
+    CACHE_DB_PATH,
+    GEMINI_MODEL,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_DISK,
+    LLM_CACHE_MAX_MEMORY,
+    LLM_CACHE_TTL,
+)
+from utils.cache import TieredCache, make_cache_key
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[TieredCache]:
+    """Return the process-wide LLM response cache, or None when disabled"""
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TieredCache(
+                    "llm",
+                    CACHE_DB_PATH,
+                    ttl=LLM_CACHE_TTL,
+                    max_memory_entries=LLM_CACHE_MAX_MEMORY,
+                    max_disk_entries=LLM_CACHE_MAX_DISK,
+                )
+    return _cache
+
+
+def llm_cache_key(instructions: str, prompt: str, model: str = GEMINI_MODEL) -> str:
+    return make_cache_key("gemini", model, instructions, prompt)
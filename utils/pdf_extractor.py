@@ -0,0 +1,154 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from config import PDF_MAX_PAGES, PDF_MAX_WORKERS
+
+PdfSource = Union[str, Path, bytes, bytearray, memoryview, BytesIO]
+
+# Pages parsed by the first task, which also counts the pages; covers nearly every resume in one pass
+FIRST_RANGE_PAGES = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """Process pool shared by all PDF parsing, bounded to PDF_MAX_WORKERS processes"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn rather than fork: Streamlit and the HTTP pools run threads,
+                # and forking a threaded process can deadlock the child
+                _executor = ProcessPoolExecutor(
+                    max_workers=PDF_MAX_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def _normalize_source(source: PdfSource) -> Union[str, bytes]:
+    """Reduce a source to something cheap to pickle: a path string or raw bytes"""
+    if isinstance(source, (str, Path)):
+        return str(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return bytes(source.getvalue())
+    return source.read()
+
+
+def read_pdf_bytes(source: PdfSource) -> bytes:
+    """Return the raw bytes of any supported source (path, bytes-like or file-like)"""
+    source = _normalize_source(source)
+    return Path(source).read_bytes() if isinstance(source, str) else source
+
+
+def _open(source: Union[str, bytes]):
+    return open(source, "rb") if isinstance(source, str) else BytesIO(source)
+
+
+def _extract_range(source: Union[str, bytes], start: int, stop: int, count_pages: bool = False) -> Tuple[List[str], int]:
+    """Text of pages [start, stop), one string per page, from a single walk of the document.
+
+    With `count_pages` the walk continues (without layout analysis) to the end and
+    the total page count is returned; otherwise the count is -1.
+    """
+    from io import StringIO
+
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    resources = PDFResourceManager()
+    output = StringIO()
+    device = TextConverter(resources, output, laparams=LAParams())
+    interpreter = PDFPageInterpreter(resources, device)
+    pages: List[str] = []
+    page_count = 0
+    try:
+        with _open(source) as fp:
+            for index, page in enumerate(PDFPage.get_pages(fp)):
+                page_count = index + 1
+                if index >= stop:
+                    if not count_pages:
+                        break
+                    continue
+                if index >= start:
+                    interpreter.process_page(page)
+                    pages.append(output.getvalue())
+                    output.seek(0)
+                    output.truncate(0)
+    finally:
+        device.close()
+    return pages, page_count if count_pages else -1
+
+
+def _split_ranges(start: int, stop: int, parts: int) -> List[Tuple[int, int]]:
+    """Contiguous, near-equal page ranges covering [start, stop)"""
+    total = stop - start
+    parts = max(1, min(parts, total))
+    bounds = [start + total * index // parts for index in range(parts + 1)]
+    return [(low, high) for low, high in zip(bounds, bounds[1:]) if high > low]
+
+
+def _page_limit(page_count: int, max_pages: Optional[int]) -> int:
+    return min(page_count, max_pages) if max_pages else page_count
+
+
+def _first_range(max_pages: Optional[int]) -> int:
+    return _page_limit(FIRST_RANGE_PAGES, max_pages)
+
+
+async def iter_pdf_pages(source: PdfSource, max_pages: Optional[int] = PDF_MAX_PAGES) -> AsyncIterator[str]:
+    """Yield the text of each page in order as soon as it is parsed.
+
+    The first task parses the opening pages and counts the rest; longer documents
+    are then split into contiguous page ranges, one per pool worker, each parsed
+    in a single walk of the document. The event loop stays free throughout.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_pdf_executor()
+    source = _normalize_source(source)
+
+    first_stop = _first_range(max_pages)
+    pages, page_count = await loop.run_in_executor(executor, _extract_range, source, 0, first_stop, True)
+    stop = _page_limit(page_count, max_pages)
+    futures = [
+        loop.run_in_executor(executor, _extract_range, source, low, high)
+        for low, high in _split_ranges(first_stop, stop, PDF_MAX_WORKERS)
+    ] if stop > first_stop else []
+    try:
+        for page in pages:
+            yield page
+        for future in futures:
+            for page in (await future)[0]:
+                yield page
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+async def extract_pdf_text_async(source: PdfSource, max_pages: Optional[int] = PDF_MAX_PAGES) -> str:
+    pages = [page async for page in iter_pdf_pages(source, max_pages)]
+    return "".join(pages)
+
+
+def extract_pdf_text(source: PdfSource, max_pages: Optional[int] = PDF_MAX_PAGES) -> str:
+    """Blocking variant for Streamlit callbacks: parses page ranges in the pool and joins them"""
+    executor = get_pdf_executor()
+    source = _normalize_source(source)
+    first_stop = _first_range(max_pages)
+    pages, page_count = executor.submit(_extract_range, source, 0, first_stop, True).result()
+    stop = _page_limit(page_count, max_pages)
+    futures = [
+        executor.submit(_extract_range, source, low, high)
+        for low, high in _split_ranges(first_stop, stop, PDF_MAX_WORKERS)
+    ] if stop > first_stop else []
+    return "".join(pages) + "".join(page for future in futures for page in future.result()[0])
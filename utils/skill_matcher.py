@@ -0,0 +1,99 @@
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+# Skill-like runs keep their attached symbols, so "C++", "C#" and "node.js" are single
+# tokens that never match the patterns "c" or "node"; other punctuation stands alone
+# (so "CI/CD" is ("ci", "/", "cd")). Trailing dots are sentence punctuation and dropped.
+_TOKEN_RE = re.compile(r"\w[\w+#.]*|[^\w\s]")
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.rstrip(".") or token for token in _TOKEN_RE.findall(text.lower())]
+
+
+class SkillMatcher:
+    """Aho–Corasick automaton over a fixed vocabulary of skill phrases.
+
+    The automaton runs over word tokens rather than characters, which makes
+    matching word-boundary aware by construction: "java" does not match inside
+    "javascript", while "machine learning" and "learning" both match in
+    "machine learning". Matching is case-insensitive and each text is scanned
+    in a single linear pass regardless of vocabulary size.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._lengths: List[int] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        seen = set()
+        for pattern in patterns:
+            tokens = tokenize(pattern) if isinstance(pattern, str) else []
+            key = " ".join(tokens)
+            if key and key not in seen:
+                seen.add(key)
+                self._add(tokens, pattern.strip().lower())
+        self._build()
+
+    def _add(self, tokens: List[str], name: str):
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = nxt
+        self._output[state] += (len(self.patterns),)
+        self.patterns.append(name)
+        self._lengths.append(len(tokens))
+
+    def _build(self):
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start_token, end_token, pattern) for every match in `text`"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for i, token in enumerate(tokenize(text)):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for pattern_id in output[state]:
+                yield i + 1 - self._lengths[pattern_id], i + 1, self.patterns[pattern_id]
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the set of vocabulary entries (lowercased) present in `text`"""
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self.patterns
+        found = set()
+        state = 0
+        for token in tokenize(text):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found.update(patterns[pattern_id] for pattern_id in output[state])
+        return found
+
+
+@lru_cache(maxsize=128)
+def get_skill_matcher(vocabulary: Tuple[str, ...]) -> SkillMatcher:
+    """Compile (or reuse) the automaton for a vocabulary; pass a tuple so it can be cached"""
+    return SkillMatcher(vocabulary)
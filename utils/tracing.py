@@ -0,0 +1,232 @@
+import contextvars
+import json
+import math
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import TRACE_BACKUPS, TRACE_FILE, TRACE_MAX_BYTES, TRACING_ENABLED
+
+# Latency histogram buckets in seconds (Prometheus `le` bounds)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation, used as a context manager (also inside coroutines).
+
+    Spans opened while another is active become its children, including across
+    asyncio tasks, which inherit the context they were created in.
+    """
+
+    __slots__ = ("name", "attrs", "trace_id", "span_id", "parent_id", "start", "duration", "error", "_perf", "_token")
+
+    def __init__(self, name: str, **attrs: Any):
+        self.name = name
+        self.attrs = attrs
+        self.span_id = uuid.uuid4().hex[:16]
+        self.trace_id = None
+        self.parent_id = None
+        self.start = 0.0
+        self.duration = 0.0
+        self.error = None
+        self._perf = 0.0
+        self._token = None
+
+    def set(self, **attrs: Any) -> "Span":
+        self.attrs.update(attrs)
+        return self
+
+    def fail(self, error: Any) -> None:
+        self.error = str(error)[:500]
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex
+        self.parent_id = parent.span_id if parent is not None else None
+        self._token = _current_span.set(self)
+        self.start = time.time()
+        self._perf = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration = time.perf_counter() - self._perf
+        if exc is not None and self.error is None:
+            self.fail(repr(exc))
+        _current_span.reset(self._token)
+        if TRACING_ENABLED:
+            METRICS.observe(self)
+            EXPORTER.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": round(self.start, 6),
+            "duration": round(self.duration, 6),
+            "error": self.error,
+            **self.attrs,
+        }
+
+
+def span(name: str, **attrs: Any) -> Span:
+    return Span(name, **attrs)
+
+
+def annotate(**attrs: Any) -> None:
+    """Attach attributes (cache hits, sizes, ...) to the innermost active span, if any"""
+    current = _current_span.get()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def payload_size(value: Any) -> int:
+    """UTF-8 size in bytes of a prompt/response string (or len() of bytes)"""
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return 0
+
+
+class JsonlExporter:
+    """Appends finished spans, one JSON object per line.
+
+    Once the file reaches `max_bytes` it is rotated to `<path>.1` (older files
+    shift up, keeping `backups` of them), so long-running processes stay bounded.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 0, backups: int = 3):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._file = None
+        for index in range(self.backups - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backups > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+    def export(self, finished: Span) -> None:
+        line = json.dumps(finished.to_dict(), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+                self._size = self._file.tell()
+            self._file.write(line)
+            self._size += len(line.encode("utf-8"))
+            if self.max_bytes and self._size >= self.max_bytes:
+                self._rotate()
+
+
+class Metrics:
+    """Per-span-name latency histograms plus error, cache-hit and payload-byte counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.buckets: Dict[str, List[int]] = defaultdict(lambda: [0] * len(BUCKETS))
+        self.sums: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.cache_hits: Dict[str, int] = defaultdict(int)
+        self.payload_bytes: Dict[str, int] = defaultdict(int)
+
+    def observe(self, finished: Span) -> None:
+        name = finished.name
+        with self._lock:
+            counts = self.buckets[name]
+            for index, bound in enumerate(BUCKETS):
+                if finished.duration <= bound:
+                    counts[index] += 1
+                    break
+            self.sums[name] += finished.duration
+            self.counts[name] += 1
+            if finished.error is not None:
+                self.errors[name] += 1
+            if finished.attrs.get("cache_hit"):
+                self.cache_hits[name] += 1
+            self.payload_bytes[name] += finished.attrs.get("request_bytes", 0) + finished.attrs.get("response_bytes", 0)
+
+    def render_prometheus(self, prefix: str = "recruiter") -> str:
+        """Prometheus text exposition of everything observed in this process"""
+        lines = [
+            f"# HELP {prefix}_span_duration_seconds Duration of traced operations",
+            f"# TYPE {prefix}_span_duration_seconds histogram",
+        ]
+        with self._lock:
+            for name in sorted(self.counts):
+                cumulative = 0
+                for bound, count in zip(BUCKETS, self.buckets[name]):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    lines.append(f'{prefix}_span_duration_seconds_bucket{{span="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{prefix}_span_duration_seconds_sum{{span="{name}"}} {self.sums[name]:.6f}')
+                lines.append(f'{prefix}_span_duration_seconds_count{{span="{name}"}} {self.counts[name]}')
+            for metric, values, help_text in (
+                ("span_errors_total", self.errors, "Traced operations that failed"),
+                ("span_cache_hits_total", self.cache_hits, "Traced operations served from a cache"),
+                ("span_payload_bytes_total", self.payload_bytes, "Request plus response bytes of traced operations"),
+            ):
+                lines.append(f"# HELP {prefix}_{metric} {help_text}")
+                lines.append(f"# TYPE {prefix}_{metric} counter")
+                for name in sorted(self.counts):
+                    lines.append(f'{prefix}_{metric}{{span="{name}"}} {values.get(name, 0)}')
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+EXPORTER = JsonlExporter(TRACE_FILE, max_bytes=TRACE_MAX_BYTES, backups=TRACE_BACKUPS)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(spans: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Latency percentiles, error and cache-hit counts per span name, slowest total first"""
+    grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for record in spans:
+        grouped[record["name"]].append(record)
+    rows = []
+    for name, records in grouped.items():
+        durations = sorted(record["duration"] for record in records)
+        rows.append({
+            "span": name,
+            "count": len(records),
+            "total_s": round(sum(durations), 3),
+            "p50_s": round(_percentile(durations, 0.5), 3),
+            "p95_s": round(_percentile(durations, 0.95), 3),
+            "max_s": round(durations[-1], 3),
+            "errors": sum(1 for record in records if record.get("error")),
+            "cache_hits": sum(1 for record in records if record.get("cache_hit")),
+        })
+    return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+
+if __name__ == "__main__":
+    # python -m utils.tracing [trace.jsonl]  ->  per-span latency table
+    path = Path(sys.argv[1] if len(sys.argv) > 1 else TRACE_FILE)
+    with open(path, encoding="utf-8") as fp:
+        rows = summarize(json.loads(line) for line in fp if line.strip())
+    header = ("span", "count", "total_s", "p50_s", "p95_s", "max_s", "errors", "cache_hits")
+    print(f"{header[0]:<24}" + "".join(f"{column:>12}" for column in header[1:]))
+    for row in rows:
+        print(f"{row['span']:<24}" + "".join(f"{row[column]!s:>12}" for column in header[1:]))